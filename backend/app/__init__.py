@@ -1,11 +1,16 @@
-"""A-DFP Firewall Backend Application"""
+"""A-DFP Firewall Backend Application
+
+Subpackages are loaded on first access rather than at import time, so
+``from app.models import ...`` does not pull in the ML services or the
+Celery workers. Import the submodule you need explicitly.
+"""
+
+import importlib
 
 __version__ = "1.0.0-beta"
 __author__ = "Fraud Detection Team"
 __description__ = "Autonomous Deepfake & Fraud Prevention Firewall"
 
-from . import api, core, models, services, utils, workers
-
 __all__ = [
     'api',
     'core',
@@ -14,3 +19,9 @@ __all__ = [
     'utils',
     'workers',
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
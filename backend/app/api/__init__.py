@@ -1,29 +1,46 @@
-"""Initialize API routers module"""
-from fastapi import APIRouter
-
-# Import all routers
-from . import (
-    auth_router,
-    sessions_router,
-)
-
-# Import other routers from routers.py
-from .routers import (
-    voice_router,
-    video_router,
-    document_router,
-    liveness_router,
-    scam_router,
-    risk_router,
-    incidents_router,
-    webhooks_router,
-    health_router,
-)
-
-# Import DeepClean AI routers from organized folders
-from .deepfake import router as deepfake_router
-from .legal import router as legal_router
-from .crawler import router as crawler_router
+"""Initialize API routers module
+
+Routers are imported on first access (PEP 562), so importing one router
+does not pull in every other router's dependencies.
+"""
+import importlib
+
+# Exported name -> (module, attribute); attribute None exports the module itself
+_ROUTERS = {
+    'auth_router': ('.auth_router', None),
+    'sessions_router': ('.sessions_router', None),
+    # Other routers from routers.py
+    'voice_router': ('.routers', 'voice_router'),
+    'video_router': ('.routers', 'video_router'),
+    'document_router': ('.routers', 'document_router'),
+    'liveness_router': ('.routers', 'liveness_router'),
+    'scam_router': ('.routers', 'scam_router'),
+    'risk_router': ('.routers', 'risk_router'),
+    'incidents_router': ('.routers', 'incidents_router'),
+    'webhooks_router': ('.routers', 'webhooks_router'),
+    'health_router': ('.routers', 'health_router'),
+    # DeepClean AI routers from organized folders
+    'deepfake_router': ('.deepfake', 'router'),
+    'legal_router': ('.legal', 'router'),
+    'crawler_router': ('.crawler', 'router'),
+}
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _ROUTERS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    module = importlib.import_module(module_name, __name__)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
 
 # Export all routers
 __all__ = [
@@ -4,35 +4,356 @@ Real-time processing, blockchain evidence, forensic reports
 """
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Depends, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse, FileResponse
-import aiofiles
+from fastapi.responses import JSONResponse, FileResponse, ORJSONResponse
+import orjson
+import aiofiles.os
 import os
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 import logging
 from datetime import datetime
-import uuid
-import json
 import asyncio
+import functools
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-from app.services.advanced_detectors import get_advanced_detector, DetectionResult
+from app.services.advanced_detectors import get_coalescing_detector, warm_up_detectors, DetectionResult
 from app.services.blockchain_evidence import (
-    create_evidence_chain, add_evidence, verify_evidence_chain, export_legal_report
+    evidence_manager, create_evidence_chain, add_evidence, verify_evidence_chain, export_legal_report
 )
 from app.services.report_generator import generate_forensic_report
+from app.core.config import settings
 from app.core.dependencies import get_current_user, get_db
+from app.utils.helpers import StorageHelper
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a WebSocket message (handles numpy scalars/arrays natively)"""
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+_PONG = _dumps({"type": "pong"})
+
+# Analyst block printed on every forensic report from this router
+_ANALYST_BASE = {
+    "organization": "DeepClean.AI",
+    "credentials": "AI-Powered Forensic Analysis"
+}
+
+
+def _analyst_info(user: Dict) -> Dict[str, str]:
+    """Report analyst details for the requesting user"""
+    return {"name": user.get('name', 'System Analyst'), **_ANALYST_BASE}
+
+
+# Session ids are cut from one os.urandom read per 256 ids instead of a
+# getrandom() syscall and UUID formatting per request. The buffer is
+# dropped in forked children so workers never share ids.
+_SESSION_ID_BYTES = 16
+_session_id_pool = bytearray()
+
+
+def _new_session_id() -> str:
+    """Random 128-bit session id as 32 hex characters"""
+    if not _session_id_pool:
+        _session_id_pool.extend(os.urandom(_SESSION_ID_BYTES * 256))
+    session_id = _session_id_pool[-_SESSION_ID_BYTES:].hex()
+    del _session_id_pool[-_SESSION_ID_BYTES:]
+    return session_id
+
+
+os.register_at_fork(after_in_child=_session_id_pool.clear)
+
+
+# Uploads live only for the duration of one analysis, so stage them on
+# tmpfs where available; they never need to reach a disk
+_DEFAULT_UPLOAD_DIR = "/dev/shm/deepclean" if os.path.isdir("/dev/shm") else "uploads"
+
+
+@functools.lru_cache(maxsize=1)
+def _upload_dir() -> Path:
+    """Upload staging directory, created once per process on first use"""
+    upload_dir = Path(os.getenv("UPLOAD_DIR", _DEFAULT_UPLOAD_DIR))
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    return upload_dir
+
+
+async def _discard_upload(path: Optional[Path]):
+    """Delete a staged upload, logging (not hiding) unexpected failures"""
+    if path is None:
+        return
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove staged upload {path}: {e}")
+
+
+@router.on_event("startup")
+async def _prepare_upload_dir():
+    _upload_dir()
+
+
+@router.on_event("startup")
+async def _warm_detectors():
+    await asyncio.to_thread(warm_up_detectors)
+
+
+@functools.lru_cache(maxsize=1)
+def _report_pool() -> ProcessPoolExecutor:
+    """
+    Worker processes for PDF report rendering.
+    
+    Charts are drawn through matplotlib's pyplot state machine, which is
+    not thread-safe, so reports are built in separate processes rather
+    than in the default thread pool. Workers start from a forkserver (spawn
+    where that is unavailable) so they do not inherit the API process's
+    threads, locks and open sockets through fork.
+    """
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=int(os.getenv("REPORT_WORKERS", "2")),
+        mp_context=multiprocessing.get_context(start_method),
+    )
+
+
+@router.on_event("shutdown")
+async def _shutdown_report_pool():
+    if _report_pool.cache_info().currsize:
+        await asyncio.to_thread(_report_pool().shutdown, cancel_futures=True)
+        _report_pool.cache_clear()
+
+
+async def _generate_report(**kwargs) -> str:
+    """Run ``generate_forensic_report`` off the event loop"""
+    loop = asyncio.get_running_loop()
+    report_path = await loop.run_in_executor(
+        _report_pool(), functools.partial(generate_forensic_report, **kwargs)
+    )
+    _remember_report(kwargs['case_id'], Path(report_path))
+    return report_path
+
+
+REPORTS_DIR = Path("reports")
+
+# case_id -> (reports dir mtime when recorded, latest report path). Any
+# report written by any worker bumps the directory mtime, which drops
+# the entry back to a directory scan.
+_latest_reports: Dict[str, tuple] = {}
+
+
+def _remember_report(case_id: str, report: Path):
+    try:
+        _latest_reports[case_id] = (REPORTS_DIR.stat().st_mtime_ns, report)
+    except OSError:
+        _latest_reports.pop(case_id, None)
+
+
+def _latest_report(case_id: str) -> Optional[Path]:
+    """Most recent forensic report for ``case_id``, or None"""
+    try:
+        dir_mtime = REPORTS_DIR.stat().st_mtime_ns
+    except OSError:
+        return None
+    
+    cached = _latest_reports.get(case_id)
+    if cached and cached[0] == dir_mtime:
+        return cached[1]
+    
+    report_files = list(REPORTS_DIR.glob(f"forensic_report_{case_id}_*.pdf"))
+    if not report_files:
+        return None
+    latest_report = max(report_files, key=lambda p: p.stat().st_mtime)
+    _latest_reports[case_id] = (dir_mtime, latest_report)
+    return latest_report
+
+
+class ConnectionManager:
+    """
+    Real-time update connections, shared across Uvicorn workers.
+    
+    Each socket of this worker gets an outbox queue drained by its own
+    writer task, so producers only serialize and enqueue and never wait
+    on a slow client. Updates are published on the Redis channel
+    ``ws:<session_id>``; the worker that holds the socket relays them
+    into its outbox. Without Redis, or when no worker is subscribed,
+    updates go straight into a local outbox. An unreachable Redis is
+    skipped for ``REDIS_RETRY_INTERVAL`` seconds before it is tried again,
+    so analyses never wait on it for longer than the short socket timeouts.
+    """
+    
+    OUTBOX_SIZE = 256
+    MIN_SEND_INTERVAL = 0.05
+    REDIS_CONNECT_TIMEOUT = 0.5
+    REDIS_SOCKET_TIMEOUT = 0.5
+    REDIS_RETRY_INTERVAL = 30.0
+    
+    def __init__(self):
+        self._outboxes: Dict[str, asyncio.Queue] = {}
+        self._writers: Dict[str, asyncio.Task] = {}
+        self._relays: Dict[str, asyncio.Task] = {}
+        self._redis = None
+        self._subscriber = None
+        self._redis_unavailable = False
+        self._redis_retry_at = 0.0
+        self._redis_errors: tuple = (OSError, asyncio.TimeoutError)
+    
+    def _get_redis(self):
+        """
+        Lazily create the async Redis client; None if redis is not
+        installed or was unreachable within the last REDIS_RETRY_INTERVAL
+        """
+        if self._redis_unavailable or time.monotonic() < self._redis_retry_at:
+            return None
+        if self._redis is None:
+            try:
+                import redis.asyncio as aioredis
+                from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+            except ImportError:
+                self._redis_unavailable = True
+                return None
+            self._redis_errors = (RedisConnectionError, RedisTimeoutError, OSError, asyncio.TimeoutError)
+            self._redis = aioredis.from_url(
+                settings.REDIS_URL,
+                socket_connect_timeout=self.REDIS_CONNECT_TIMEOUT,
+                socket_timeout=self.REDIS_SOCKET_TIMEOUT,
+            )
+            # Subscriptions block in reads until a message arrives, so their
+            # client only bounds the connect
+            self._subscriber = aioredis.from_url(
+                settings.REDIS_URL,
+                socket_connect_timeout=self.REDIS_CONNECT_TIMEOUT,
+            )
+        return self._redis
+    
+    def _redis_failed(self, action: str, error: Exception):
+        """Log a Redis failure, backing off from Redis if it is unreachable"""
+        if isinstance(error, self._redis_errors):
+            self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_INTERVAL
+            logger.warning(
+                f"Redis unreachable ({action}): {error}; delivering locally "
+                f"for the next {self.REDIS_RETRY_INTERVAL:.0f}s"
+            )
+        else:
+            logger.warning(f"Redis {action} failed, delivering locally: {error}")
+    
+    async def connect(self, session_id: str, websocket: WebSocket):
+        """Accept a client, start its writer and subscribe to its channel"""
+        await websocket.accept()
+        outbox = asyncio.Queue(maxsize=self.OUTBOX_SIZE)
+        self._outboxes[session_id] = outbox
+        self._writers[session_id] = asyncio.create_task(self._pump(session_id, websocket, outbox))
+        
+        if self._get_redis() is None:
+            return
+        try:
+            pubsub = self._subscriber.pubsub()
+            await pubsub.subscribe(f"ws:{session_id}")
+        except Exception as e:
+            self._redis_failed(f"subscribe for {session_id}", e)
+            return
+        self._relays[session_id] = asyncio.create_task(self._relay(session_id, pubsub))
+    
+    def disconnect(self, session_id: str):
+        """Forget a client and stop its writer and relay"""
+        self._outboxes.pop(session_id, None)
+        for tasks in (self._writers, self._relays):
+            task = tasks.pop(session_id, None)
+            if task and task is not asyncio.current_task():
+                task.cancel()
+    
+    def enqueue(self, session_id: str, payload: bytes):
+        """Queue an already-serialized message for this worker's socket"""
+        outbox = self._outboxes.get(session_id)
+        if outbox is None:
+            return
+        try:
+            outbox.put_nowait(payload)
+        except asyncio.QueueFull:
+            logger.warning(f"WebSocket outbox full for session {session_id}, dropping update")
+    
+    @staticmethod
+    def _coalesce(batch: List[bytes]) -> List[bytes]:
+        """Drop progress updates superseded by a later one for the same stage"""
+        if len(batch) < 2:
+            return batch
+        messages = [orjson.loads(payload) for payload in batch]
+        latest = {
+            message.get("stage"): i
+            for i, message in enumerate(messages)
+            if message.get("type") == "progress"
+        }
+        return [
+            payload for i, (payload, message) in enumerate(zip(batch, messages))
+            if message.get("type") != "progress" or latest[message.get("stage")] == i
+        ]
+    
+    async def _pump(self, session_id: str, websocket: WebSocket, outbox: asyncio.Queue):
+        """
+        Write queued messages to the socket.
+        
+        Sends at most one burst per ``MIN_SEND_INTERVAL``; progress updates
+        that pile up meanwhile are collapsed to the newest per stage, while
+        every other message (complete, error, ...) is always delivered.
+        """
+        try:
+            while True:
+                batch = [await outbox.get()]
+                while not outbox.empty():
+                    batch.append(outbox.get_nowait())
+                for payload in self._coalesce(batch):
+                    await websocket.send_text(payload.decode())
+                await asyncio.sleep(self.MIN_SEND_INTERVAL)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error sending WebSocket update: {e}")
+            self.disconnect(session_id)
+    
+    async def _relay(self, session_id: str, pubsub):
+        """Forward messages published for ``session_id`` to the local outbox"""
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                if session_id not in self._outboxes:
+                    break
+                self.enqueue(session_id, message["data"])
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Error relaying WebSocket update: {e}")
+        finally:
+            try:
+                await pubsub.unsubscribe()
+                await pubsub.close()
+            except Exception:
+                pass
+    
+    async def send(self, session_id: str, message: Dict[str, Any]):
+        """Deliver ``message`` to the client of ``session_id`` on any worker"""
+        payload = _dumps(message)
+        
+        redis = self._get_redis()
+        if redis is not None:
+            try:
+                if await redis.publish(f"ws:{session_id}", payload):
+                    return
+            except Exception as e:
+                self._redis_failed("publish", e)
+        
+        self.enqueue(session_id, payload)
 
-# Upload directory
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
 
 # Active WebSocket connections for real-time updates
-active_connections: Dict[str, WebSocket] = {}
+manager = ConnectionManager()
 
 
 # ============================================================================
@@ -45,8 +366,7 @@ async def websocket_analysis(websocket: WebSocket, session_id: str):
     WebSocket endpoint for real-time analysis updates
     Client receives progress updates as analysis proceeds
     """
-    await websocket.accept()
-    active_connections[session_id] = websocket
+    await manager.connect(session_id, websocket)
     
     try:
         while True:
@@ -54,23 +374,17 @@ async def websocket_analysis(websocket: WebSocket, session_id: str):
             data = await websocket.receive_text()
             
             if data == "ping":
-                await websocket.send_json({"type": "pong"})
+                manager.enqueue(session_id, _PONG)
                 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for session {session_id}")
-        if session_id in active_connections:
-            del active_connections[session_id]
+    finally:
+        manager.disconnect(session_id)
 
 
 async def send_progress_update(session_id: str, progress: Dict[str, Any]):
     """Send progress update to connected WebSocket client"""
-    if session_id in active_connections:
-        try:
-            await active_connections[session_id].send_json(progress)
-        except Exception as e:
-            logger.error(f"Error sending WebSocket update: {e}")
-            if session_id in active_connections:
-                del active_connections[session_id]
+    await manager.send(session_id, progress)
 
 
 # ============================================================================
@@ -93,8 +407,9 @@ async def analyze_video_advanced(
     - Forensic PDF report generation
     - Multiple detection methods combined
     """
+    video_path = None
     try:
-        session_id = str(uuid.uuid4())
+        session_id = _new_session_id()
         if not case_id:
             case_id = f"CASE_{session_id[:8]}"
         
@@ -107,15 +422,13 @@ async def analyze_video_advanced(
         })
         
         # Save uploaded file
-        video_path = UPLOAD_DIR / f"video_{session_id}.mp4"
-        async with aiofiles.open(video_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        video_path = _upload_dir() / f"video_{session_id}.mp4"
+        file_size = await StorageHelper.stream_upload(file, video_path)
         
         file_metadata = {
             "filename": file.filename,
             "content_type": file.content_type,
-            "size": len(content),
+            "size": file_size,
             "upload_time": datetime.now().isoformat(),
             "session_id": session_id
         }
@@ -128,8 +441,7 @@ async def analyze_video_advanced(
         })
         
         # Run advanced detection
-        detector = get_advanced_detector('video')
-        detection_result = detector.analyze_video(str(video_path))
+        detection_result, content_digest = await get_coalescing_detector('video').analyze_with_digest(str(video_path))
         
         await send_progress_update(session_id, {
             "type": "progress",
@@ -151,23 +463,19 @@ async def analyze_video_advanced(
             })
             
             # Create or get evidence chain
-            from app.services.blockchain_evidence import evidence_manager
             chain = evidence_manager.get_chain(case_id)
             if not chain:
                 chain = evidence_manager.create_case(case_id, current_user.get('user_id', 'system'))
             
             # Add evidence to chain
-            evidence_block = add_evidence(
+            evidence_block = await asyncio.to_thread(
+                add_evidence,
                 case_id=case_id,
                 evidence_path=str(video_path),
                 evidence_type="VIDEO_ANALYSIS",
-                detection_result={
-                    "is_fake": detection_result.is_fake,
-                    "confidence": detection_result.confidence,
-                    "fake_probability": detection_result.fake_probability,
-                    "anomalies": detection_result.anomalies_found
-                },
-                file_metadata=file_metadata
+                detection_result=detection_result.evidence_summary(),
+                file_metadata=file_metadata,
+                evidence_hash=content_digest
             )
             
             # Get chain summary
@@ -176,7 +484,7 @@ async def analyze_video_advanced(
                 "block_hash": evidence_block.block_hash,
                 "chain_index": evidence_block.chain_index,
                 "timestamp": evidence_block.timestamp,
-                "chain_integrity": verify_evidence_chain(case_id)
+                "chain_integrity": await asyncio.to_thread(verify_evidence_chain, case_id, True)
             }
         
         # Generate forensic report
@@ -189,29 +497,12 @@ async def analyze_video_advanced(
                 "message": "Generating forensic report..."
             })
             
-            analyst_info = {
-                "name": current_user.get('name', 'System Analyst'),
-                "organization": "DeepClean.AI",
-                "credentials": "AI-Powered Forensic Analysis"
-            }
-            
-            report_path = generate_forensic_report(
+            report_path = await _generate_report(
                 case_id=case_id,
-                detection_result={
-                    "is_fake": detection_result.is_fake,
-                    "confidence": detection_result.confidence,
-                    "fake_probability": detection_result.fake_probability,
-                    "real_probability": detection_result.real_probability,
-                    "detection_method": detection_result.detection_method,
-                    "analysis_details": detection_result.analysis_details,
-                    "anomalies_found": detection_result.anomalies_found,
-                    "forensic_metrics": detection_result.forensic_metrics,
-                    "processing_time": detection_result.processing_time,
-                    "timestamp": detection_result.timestamp
-                },
+                detection_result=detection_result.to_dict(),
                 evidence_chain=evidence_chain_data,
                 file_metadata=file_metadata,
-                analyst_info=analyst_info
+                analyst_info=_analyst_info(current_user)
             )
         
         await send_progress_update(session_id, {
@@ -221,23 +512,11 @@ async def analyze_video_advanced(
             "message": "Analysis complete!"
         })
         
-        # Cleanup
-        try:
-            os.remove(video_path)
-        except:
-            pass
-        
         return {
             "session_id": session_id,
             "case_id": case_id,
             "analysis_type": "advanced_video",
-            "detection_result": {
-                "is_fake": detection_result.is_fake,
-                "confidence": detection_result.confidence,
-                "fake_probability": detection_result.fake_probability,
-                "real_probability": detection_result.real_probability,
-                "detection_method": detection_result.detection_method
-            },
+            "detection_result": detection_result.summary(),
             "anomalies_found": detection_result.anomalies_found,
             "forensic_metrics": detection_result.forensic_metrics,
             "processing_time": detection_result.processing_time,
@@ -256,6 +535,8 @@ async def analyze_video_advanced(
             "message": f"Analysis failed: {str(e)}"
         })
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await _discard_upload(video_path)
 
 
 # ============================================================================
@@ -279,48 +560,42 @@ async def analyze_audio_advanced(
     - Blockchain evidence
     - Forensic reports
     """
+    audio_path = None
     try:
-        session_id = str(uuid.uuid4())
+        session_id = _new_session_id()
         if not case_id:
             case_id = f"CASE_{session_id[:8]}"
         
         # Save uploaded file
-        audio_path = UPLOAD_DIR / f"audio_{session_id}.wav"
-        async with aiofiles.open(audio_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        audio_path = _upload_dir() / f"audio_{session_id}.wav"
+        file_size = await StorageHelper.stream_upload(file, audio_path)
         
         file_metadata = {
             "filename": file.filename,
             "content_type": file.content_type,
-            "size": len(content),
+            "size": file_size,
             "upload_time": datetime.now().isoformat(),
             "session_id": session_id
         }
         
         # Run advanced detection
-        detector = get_advanced_detector('audio')
-        detection_result = detector.analyze_audio(str(audio_path))
+        detection_result, content_digest = await get_coalescing_detector('audio').analyze_with_digest(str(audio_path))
         
         # Blockchain evidence
         evidence_chain_data = {}
         if enable_blockchain:
-            from app.services.blockchain_evidence import evidence_manager
             chain = evidence_manager.get_chain(case_id)
             if not chain:
                 chain = evidence_manager.create_case(case_id, current_user.get('user_id', 'system'))
             
-            evidence_block = add_evidence(
+            evidence_block = await asyncio.to_thread(
+                add_evidence,
                 case_id=case_id,
                 evidence_path=str(audio_path),
                 evidence_type="AUDIO_ANALYSIS",
-                detection_result={
-                    "is_fake": detection_result.is_fake,
-                    "confidence": detection_result.confidence,
-                    "fake_probability": detection_result.fake_probability,
-                    "anomalies": detection_result.anomalies_found
-                },
-                file_metadata=file_metadata
+                detection_result=detection_result.evidence_summary(),
+                file_metadata=file_metadata,
+                evidence_hash=content_digest
             )
             
             evidence_chain_data = {
@@ -328,54 +603,25 @@ async def analyze_audio_advanced(
                 "block_hash": evidence_block.block_hash,
                 "chain_index": evidence_block.chain_index,
                 "timestamp": evidence_block.timestamp,
-                "chain_integrity": verify_evidence_chain(case_id)
+                "chain_integrity": await asyncio.to_thread(verify_evidence_chain, case_id, True)
             }
         
         # Generate report
         report_path = None
         if generate_report:
-            analyst_info = {
-                "name": current_user.get('name', 'System Analyst'),
-                "organization": "DeepClean.AI",
-                "credentials": "AI-Powered Forensic Analysis"
-            }
-            
-            report_path = generate_forensic_report(
+            report_path = await _generate_report(
                 case_id=case_id,
-                detection_result={
-                    "is_fake": detection_result.is_fake,
-                    "confidence": detection_result.confidence,
-                    "fake_probability": detection_result.fake_probability,
-                    "real_probability": detection_result.real_probability,
-                    "detection_method": detection_result.detection_method,
-                    "analysis_details": detection_result.analysis_details,
-                    "anomalies_found": detection_result.anomalies_found,
-                    "forensic_metrics": detection_result.forensic_metrics,
-                    "processing_time": detection_result.processing_time,
-                    "timestamp": detection_result.timestamp
-                },
+                detection_result=detection_result.to_dict(),
                 evidence_chain=evidence_chain_data,
                 file_metadata=file_metadata,
-                analyst_info=analyst_info
+                analyst_info=_analyst_info(current_user)
             )
         
-        # Cleanup
-        try:
-            os.remove(audio_path)
-        except:
-            pass
-        
         return {
             "session_id": session_id,
             "case_id": case_id,
             "analysis_type": "advanced_audio",
-            "detection_result": {
-                "is_fake": detection_result.is_fake,
-                "confidence": detection_result.confidence,
-                "fake_probability": detection_result.fake_probability,
-                "real_probability": detection_result.real_probability,
-                "detection_method": detection_result.detection_method
-            },
+            "detection_result": detection_result.summary(),
             "anomalies_found": detection_result.anomalies_found,
             "forensic_metrics": detection_result.forensic_metrics,
             "processing_time": detection_result.processing_time,
@@ -388,6 +634,8 @@ async def analyze_audio_advanced(
     except Exception as e:
         logger.error(f"Error in advanced audio analysis: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await _discard_upload(audio_path)
 
 
 # ============================================================================
@@ -412,48 +660,42 @@ async def analyze_image_advanced(
     - Blockchain evidence
     - Forensic reports
     """
+    image_path = None
     try:
-        session_id = str(uuid.uuid4())
+        session_id = _new_session_id()
         if not case_id:
             case_id = f"CASE_{session_id[:8]}"
         
         # Save uploaded file
-        image_path = UPLOAD_DIR / f"image_{session_id}.jpg"
-        async with aiofiles.open(image_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        image_path = _upload_dir() / f"image_{session_id}.jpg"
+        file_size = await StorageHelper.stream_upload(file, image_path)
         
         file_metadata = {
             "filename": file.filename,
             "content_type": file.content_type,
-            "size": len(content),
+            "size": file_size,
             "upload_time": datetime.now().isoformat(),
             "session_id": session_id
         }
         
         # Run advanced detection
-        detector = get_advanced_detector('image')
-        detection_result = detector.analyze_image(str(image_path))
+        detection_result, content_digest = await get_coalescing_detector('image').analyze_with_digest(str(image_path))
         
         # Blockchain evidence
         evidence_chain_data = {}
         if enable_blockchain:
-            from app.services.blockchain_evidence import evidence_manager
             chain = evidence_manager.get_chain(case_id)
             if not chain:
                 chain = evidence_manager.create_case(case_id, current_user.get('user_id', 'system'))
             
-            evidence_block = add_evidence(
+            evidence_block = await asyncio.to_thread(
+                add_evidence,
                 case_id=case_id,
                 evidence_path=str(image_path),
                 evidence_type="IMAGE_ANALYSIS",
-                detection_result={
-                    "is_fake": detection_result.is_fake,
-                    "confidence": detection_result.confidence,
-                    "fake_probability": detection_result.fake_probability,
-                    "anomalies": detection_result.anomalies_found
-                },
-                file_metadata=file_metadata
+                detection_result=detection_result.evidence_summary(),
+                file_metadata=file_metadata,
+                evidence_hash=content_digest
             )
             
             evidence_chain_data = {
@@ -461,54 +703,25 @@ async def analyze_image_advanced(
                 "block_hash": evidence_block.block_hash,
                 "chain_index": evidence_block.chain_index,
                 "timestamp": evidence_block.timestamp,
-                "chain_integrity": verify_evidence_chain(case_id)
+                "chain_integrity": await asyncio.to_thread(verify_evidence_chain, case_id, True)
             }
         
         # Generate report
         report_path = None
         if generate_report:
-            analyst_info = {
-                "name": current_user.get('name', 'System Analyst'),
-                "organization": "DeepClean.AI",
-                "credentials": "AI-Powered Forensic Analysis"
-            }
-            
-            report_path = generate_forensic_report(
+            report_path = await _generate_report(
                 case_id=case_id,
-                detection_result={
-                    "is_fake": detection_result.is_fake,
-                    "confidence": detection_result.confidence,
-                    "fake_probability": detection_result.fake_probability,
-                    "real_probability": detection_result.real_probability,
-                    "detection_method": detection_result.detection_method,
-                    "analysis_details": detection_result.analysis_details,
-                    "anomalies_found": detection_result.anomalies_found,
-                    "forensic_metrics": detection_result.forensic_metrics,
-                    "processing_time": detection_result.processing_time,
-                    "timestamp": detection_result.timestamp
-                },
+                detection_result=detection_result.to_dict(),
                 evidence_chain=evidence_chain_data,
                 file_metadata=file_metadata,
-                analyst_info=analyst_info
+                analyst_info=_analyst_info(current_user)
             )
         
-        # Cleanup
-        try:
-            os.remove(image_path)
-        except:
-            pass
-        
         return {
             "session_id": session_id,
             "case_id": case_id,
             "analysis_type": "advanced_image",
-            "detection_result": {
-                "is_fake": detection_result.is_fake,
-                "confidence": detection_result.confidence,
-                "fake_probability": detection_result.fake_probability,
-                "real_probability": detection_result.real_probability,
-                "detection_method": detection_result.detection_method
-            },
+            "detection_result": detection_result.summary(),
             "anomalies_found": detection_result.anomalies_found,
             "forensic_metrics": detection_result.forensic_metrics,
             "processing_time": detection_result.processing_time,
@@ -521,6 +734,8 @@ async def analyze_image_advanced(
     except Exception as e:
         logger.error(f"Error in advanced image analysis: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await _discard_upload(image_path)
 
 
 # ============================================================================
@@ -537,7 +752,6 @@ async def get_evidence_chain(
     if not chain_data.get('valid'):
         return {"error": "Case not found or chain compromised", "data": chain_data}
     
-    from app.services.blockchain_evidence import evidence_manager
     chain = evidence_manager.get_chain(case_id)
     if not chain:
         raise HTTPException(status_code=404, detail=f"Case {case_id} not found")
@@ -569,25 +783,26 @@ async def download_forensic_report(
     current_user: Dict = Depends(get_current_user)
 ):
     """Download PDF forensic report"""
-    from pathlib import Path
-    reports_dir = Path("reports")
-    
     # Find most recent report for this case
-    report_files = list(reports_dir.glob(f"forensic_report_{case_id}_*.pdf"))
-    if not report_files:
+    latest_report = _latest_report(case_id)
+    try:
+        stat_result = latest_report.stat() if latest_report else None
+    except OSError:
+        stat_result = None
+    if stat_result is None:
         raise HTTPException(status_code=404, detail="Report not found")
     
-    latest_report = max(report_files, key=lambda p: p.stat().st_mtime)
-    
+    # FileResponse streams the file with sendfile(2) where the server
+    # supports it; passing stat_result saves it a second stat
     return FileResponse(
         path=str(latest_report),
         filename=latest_report.name,
-        media_type="application/pdf"
+        media_type="application/pdf",
+        stat_result=stat_result
     )
 
 
 @router.get("/cases/list", tags=["Case Management"])
 async def list_all_cases(current_user: Dict = Depends(get_current_user)):
     """List all evidence cases"""
-    from app.services.blockchain_evidence import evidence_manager
     return evidence_manager.list_all_cases()
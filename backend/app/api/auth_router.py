@@ -3,22 +3,104 @@ Authentication router for A-DFP Firewall
 User registration, login, token refresh, password reset
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Body
+from sqlalchemy import bindparam, or_, select, update
 from sqlalchemy.orm import Session
-from datetime import timedelta
+from datetime import datetime
+from typing import Dict, Tuple
+import asyncio
+import functools
 import logging
+import secrets
+import time
 
 from app.core.security import JWTManager, PasswordManager
 from app.core.config import settings
-from app.core.dependencies import get_db, get_current_user, jwt_manager
-from app.models.database import User
+from app.core.dependencies import (
+    get_db, get_current_user, get_token_user_id, load_active_user, jwt_manager
+)
+from app.models.database import SessionLocal, User
 from app.models.schemas import (
-    UserCreate, LoginRequest, TokenResponse, RefreshTokenRequest, UserResponse
+    UserCreate, UserUpdate, LoginRequest, TokenResponse, RefreshTokenRequest, UserResponse
 )
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+# expires_in of issued access tokens (JWTManager's default lifetime)
+_ACCESS_TTL_SECONDS = int(JWTManager.ACCESS_TOKEN_TTL.total_seconds())
+
+# Prebuilt statements for the per-request user lookups; the Select trees
+# are built once and their compiled SQL is reused from the engine cache
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_TAKEN_EMAIL_OR_USERNAME = select(User.email, User.username).where(
+    or_(User.email == bindparam("email"), User.username == bindparam("username"))
+)
+_USERNAME_TAKEN_BY_OTHER = select(User.id).where(
+    User.username == bindparam("username"), User.id != bindparam("user_id")
+).limit(1)
+
+@functools.lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    """
+    Hash verified against when the login email is unknown
+    
+    That path then costs one Argon2 verify like a real password check, so
+    response timing does not reveal which emails are registered. Accounts
+    still on a legacy bcrypt hash cost a bcrypt verify instead, so until
+    every hash has been migrated on login, timing can tell those accounts
+    apart. Hashed on the first unknown-email login, not at import.
+    """
+    return PasswordManager.hash_password(secrets.token_urlsafe(16))
+
+
+def _user_json(user: User) -> bytes:
+    """Serialize a loaded User row as a UserResponse without re-validating its columns"""
+    return UserResponse.model_construct(
+        id=user.id,
+        email=user.email,
+        username=user.username,
+        role=user.role.value,
+        organization=user.organization,
+        is_active=user.is_active,
+        is_verified=user.is_verified,
+        created_at=user.created_at,
+        last_login=user.last_login
+    ).model_dump_json().encode()
+
+
+def _user_response(user: User, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Prebuilt UserResponse body for a loaded User row
+    
+    Returning a Response makes FastAPI skip validating it against the
+    route's response_model, which then only documents the schema.
+    """
+    return Response(content=_user_json(user), media_type="application/json", status_code=status_code)
+
+
+# Serialized /auth/me bodies by user ID, as (expires_at, body). Polling
+# clients hit this instead of the database; profile edits in this process
+# evict the entry, other workers see them within the TTL.
+ME_CACHE_TTL = 10.0
+ME_CACHE_SIZE = 10_000
+_me_cache: Dict[str, Tuple[float, bytes]] = {}
+
+
+def _load_me(user_id: str) -> bytes:
+    """Load the user and serialize their profile, caching the body"""
+    db = SessionLocal()
+    try:
+        body = _user_json(load_active_user(db, user_id))
+    finally:
+        db.close()
+    
+    if len(_me_cache) >= ME_CACHE_SIZE:
+        # Evict the oldest entry (dicts keep insertion order)
+        _me_cache.pop(next(iter(_me_cache)), None)
+    _me_cache[user_id] = (time.monotonic() + ME_CACHE_TTL, body)
+    return body
+
 
 @router.post(
     "/register",
@@ -30,7 +112,7 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 async def register(
     user_data: UserCreate,
     db: Session = Depends(get_db)
-) -> UserResponse:
+) -> Response:
     """
     Register new user account
     
@@ -45,26 +127,28 @@ async def register(
     Raises:
         400: Email or username already exists
     """
-    # Check if email already exists
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
-    if existing_email:
+    # Check email and username uniqueness in one round-trip
+    taken = db.execute(
+        _TAKEN_EMAIL_OR_USERNAME,
+        {"email": user_data.email, "username": user_data.username}
+    ).all()
+    
+    if any(row.email == user_data.email for row in taken):
         logger.warning(f"Registration attempt with existing email: {user_data.email}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Check if username already exists
-    existing_username = db.query(User).filter(User.username == user_data.username).first()
-    if existing_username:
+    if taken:
         logger.warning(f"Registration attempt with existing username: {user_data.username}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
         )
     
-    # Hash password
-    hashed_password = PasswordManager.hash_password(user_data.password)
+    # Hash password (bcrypt is deliberately slow; keep it off the event loop)
+    hashed_password = await asyncio.to_thread(PasswordManager.hash_password, user_data.password)
     
     # Create new user
     new_user = User(
@@ -80,17 +164,7 @@ async def register(
         db.refresh(new_user)
         logger.info(f"User registered: {new_user.email}")
         
-        return UserResponse(
-            id=new_user.id,
-            email=new_user.email,
-            username=new_user.username,
-            role=new_user.role.value,
-            organization=new_user.organization,
-            is_active=new_user.is_active,
-            is_verified=new_user.is_verified,
-            created_at=new_user.created_at,
-            last_login=new_user.last_login
-        )
+        return _user_response(new_user, status.HTTP_201_CREATED)
     except Exception as e:
         db.rollback()
         logger.error(f"Registration error: {str(e)}")
@@ -120,7 +194,14 @@ async def login(
     - expires_in: Seconds until access token expires
     """
     # Find user by email
-    user = db.query(User).filter(User.email == credentials.email).first()
+    user = db.execute(_USER_BY_EMAIL, {"email": credentials.email}).scalar_one_or_none()
+    
+    # Verify password (against the dummy hash for unknown emails)
+    target_hash = user.hashed_password if user else None
+    password_ok, new_hash = await asyncio.to_thread(
+        lambda: PasswordManager.verify_and_update(credentials.password, target_hash or _dummy_hash())
+    )
+    
     if not user:
         logger.warning(f"Login attempt with non-existent email: {credentials.email}")
         raise HTTPException(
@@ -128,8 +209,7 @@ async def login(
             detail="Invalid email or password"
         )
     
-    # Verify password
-    if not PasswordManager.verify_password(credentials.password, user.hashed_password):
+    if not password_ok:
         logger.warning(f"Failed login attempt for: {credentials.email}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -146,26 +226,28 @@ async def login(
     # Generate tokens
     access_token = jwt_manager.create_access_token(
         user_id=user.id,
-        role=user.role.value,
-        expires_delta=timedelta(hours=24)
+        role=user.role.value
     )
     
     refresh_token = jwt_manager.create_refresh_token(
-        user_id=user.id,
-        expires_delta=timedelta(days=30)
+        user_id=user.id
     )
     
-    # Update last_login
-    user.last_login = user.created_at.__class__.utcnow() if hasattr(user.created_at.__class__, 'utcnow') else None
+    # Update last_login in one UPDATE, upgrading legacy bcrypt (or
+    # outdated-cost) hashes while we have the password
+    values = {"last_login": datetime.utcnow()}
+    if new_hash:
+        values["hashed_password"] = new_hash
+    db.execute(update(User).where(User.id == user.id).values(**values))
     db.commit()
     
-    logger.info(f"User logged in: {user.email}")
+    logger.info(f"User logged in: {credentials.email}")
     
     return TokenResponse(
         access_token=access_token,
         refresh_token=refresh_token,
         token_type="bearer",
-        expires_in=86400  # 24 hours in seconds
+        expires_in=_ACCESS_TTL_SECONDS
     )
 
 
@@ -200,8 +282,8 @@ async def refresh_token(
         
         user_id = payload.get("sub")
         
-        # Get user from database
-        user = db.query(User).filter(User.id == user_id).first()
+        # Get user from database (identity map first, then a PK lookup)
+        user = db.get(User, user_id) if isinstance(user_id, str) else None
         if not user or not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -211,20 +293,18 @@ async def refresh_token(
         # Generate new tokens
         access_token = jwt_manager.create_access_token(
             user_id=user.id,
-            role=user.role.value,
-            expires_delta=timedelta(hours=24)
+            role=user.role.value
         )
         
         refresh_token_new = jwt_manager.create_refresh_token(
-            user_id=user.id,
-            expires_delta=timedelta(days=30)
+            user_id=user.id
         )
         
         return TokenResponse(
             access_token=access_token,
             refresh_token=refresh_token_new,
             token_type="bearer",
-            expires_in=86400
+            expires_in=_ACCESS_TTL_SECONDS
         )
     
     except HTTPException:
@@ -240,10 +320,11 @@ async def refresh_token(
 @router.post(
     "/logout",
     status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response,
     summary="User Logout",
     description="Logout the current user (sign out)"
 )
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(current_user: User = Depends(get_current_user)) -> Response:
     """
     Logout user (invalidate tokens on client side)
     
@@ -252,7 +333,7 @@ async def logout(current_user: User = Depends(get_current_user)):
     """
     logger.info(f"User logged out: {current_user.email}")
     # In production, add token to Redis blacklist
-    return None
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @router.get(
@@ -261,19 +342,14 @@ async def logout(current_user: User = Depends(get_current_user)):
     summary="Get Current User",
     description="Get the current authenticated user's profile"
 )
-async def get_me(current_user: User = Depends(get_current_user)) -> UserResponse:
+async def get_me(user_id: str = Depends(get_token_user_id)) -> Response:
     """Get current user profile"""
-    return UserResponse(
-        id=current_user.id,
-        email=current_user.email,
-        username=current_user.username,
-        role=current_user.role.value,
-        organization=current_user.organization,
-        is_active=current_user.is_active,
-        is_verified=current_user.is_verified,
-        created_at=current_user.created_at,
-        last_login=current_user.last_login
-    )
+    cached = _me_cache.get(user_id)
+    if cached is not None and cached[0] > time.monotonic():
+        body = cached[1]
+    else:
+        body = await asyncio.to_thread(_load_me, user_id)
+    return Response(content=body, media_type="application/json")
 
 
 @router.put(
@@ -283,44 +359,42 @@ async def get_me(current_user: User = Depends(get_current_user)) -> UserResponse
     description="Update the current user's profile information"
 )
 async def update_me(
-    update_data,
+    update_data: UserUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
-) -> UserResponse:
+) -> Response:
     """Update current user profile"""
     try:
-        # Update allowed fields
-        if hasattr(update_data, 'username') and update_data.username:
+        # Update allowed fields that were sent with a value
+        changes = {
+            field: value
+            for field, value in update_data.model_dump(
+                exclude_unset=True, include={"username", "organization"}
+            ).items()
+            if value
+        }
+        
+        if "username" in changes:
             # Check if new username is unique
-            existing = db.query(User).filter(
-                User.username == update_data.username,
-                User.id != current_user.id
+            existing = db.execute(
+                _USERNAME_TAKEN_BY_OTHER,
+                {"username": changes["username"], "user_id": current_user.id}
             ).first()
             if existing:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Username already taken"
                 )
-            current_user.username = update_data.username
         
-        if hasattr(update_data, 'organization') and update_data.organization:
-            current_user.organization = update_data.organization
+        for field, value in changes.items():
+            setattr(current_user, field, value)
         
         db.commit()
         db.refresh(current_user)
+        _me_cache.pop(current_user.id, None)
         logger.info(f"User profile updated: {current_user.email}")
         
-        return UserResponse(
-            id=current_user.id,
-            email=current_user.email,
-            username=current_user.username,
-            role=current_user.role.value,
-            organization=current_user.organization,
-            is_active=current_user.is_active,
-            is_verified=current_user.is_verified,
-            created_at=current_user.created_at,
-            last_login=current_user.last_login
-        )
+        return _user_response(current_user)
     
     except HTTPException:
         raise
@@ -348,7 +422,7 @@ async def request_password_reset(
     
     - **email**: User email address
     """
-    user = db.query(User).filter(User.email == email).first()
+    user = db.execute(_USER_BY_EMAIL, {"email": email}).scalar_one_or_none()
     
     if not user:
         # Don't reveal if email exists (security best practice)
@@ -5,17 +5,25 @@ Scan web for deepfake content distribution
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Awaitable
 from datetime import datetime
 import uuid
 import logging
 import asyncio
 import hashlib
-import imagehash
+import cv2
+import numpy as np
 from PIL import Image
 import io
+import threading
+from collections import OrderedDict
 import aiohttp
 
+try:
+    import imagehash  # optional: only the wavelet and color hashes need it
+except ImportError:
+    imagehash = None
+
 from app.core.dependencies import get_current_user, get_db
 from app.models.database import User
 from pydantic import BaseModel
@@ -24,6 +32,37 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Shared across all engine/platform lookups so TCP/TLS connections and DNS
+# answers are reused between requests
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def _http() -> aiohttp.ClientSession:
+    """Pooled HTTP client session, created on first use"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=10,
+                ttl_dns_cache=300,
+                keepalive_timeout=30,
+            ),
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+    return _http_session
+
+
+@router.on_event("startup")
+async def _open_http_session():
+    _http()
+
+
+@router.on_event("shutdown")
+async def _close_http_session():
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+
 
 # ============================================================================
 # DATA MODELS
@@ -60,44 +99,313 @@ class ContentFingerprint(BaseModel):
 # PERCEPTUAL HASHING ENGINE
 # ============================================================================
 
+# Chunk small enough to stay in L2 between the MD5 and SHA-256 updates
+_DIGEST_CHUNK = 256 * 1024
+
+
+def _content_digests(data: bytes) -> Tuple[str, str]:
+    """MD5 and SHA-256 hex digests of ``data`` in one pass over memory"""
+    md5 = hashlib.md5()
+    sha256 = hashlib.sha256()
+    view = memoryview(data)
+    for start in range(0, len(view), _DIGEST_CHUNK):
+        chunk = view[start:start + _DIGEST_CHUNK]
+        md5.update(chunk)
+        sha256.update(chunk)
+    return md5.hexdigest(), sha256.hexdigest()
+
+
+async def _read_upload(file: UploadFile, chunk_size: int = 1 << 20) -> Tuple[bytes, Tuple[str, str]]:
+    """
+    Read an upload chunk by chunk, hashing as it arrives
+    
+    Returns the content and its (MD5, SHA-256) hex digests, so the digests
+    are done by the time the upload is and need no second pass.
+    """
+    md5 = hashlib.md5()
+    sha256 = hashlib.sha256()
+    buf = io.BytesIO()
+    while chunk := await file.read(chunk_size):
+        md5.update(chunk)
+        sha256.update(chunk)
+        buf.write(chunk)
+    return buf.getvalue(), (md5.hexdigest(), sha256.hexdigest())
+
+
+# JPEG start-of-frame markers (SOF0-SOF15, minus DHT/JPG/DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def _jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """(height, width) from a JPEG's SOF header, or None if not a readable JPEG"""
+    if data[:2] != b"\xff\xd8":
+        return None
+    pos = 2
+    while pos + 9 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height = int.from_bytes(data[pos + 5:pos + 7], "big")
+            width = int.from_bytes(data[pos + 7:pos + 9], "big")
+            return (height, width) if height and width else None
+        if marker == 0xDA:  # start of scan without a frame header
+            return None
+        pos += 2 + int.from_bytes(data[pos + 2:pos + 4], "big")
+    return None
+
+
+def _dct_basis(n: int, rows: int) -> np.ndarray:
+    """First ``rows`` rows of scipy.fftpack's unnormalized DCT-II matrix for length ``n``"""
+    k = np.arange(rows)[:, None]
+    i = np.arange(n)[None, :]
+    return 2.0 * np.cos(np.pi * k * (2 * i + 1) / (2 * n))
+
+
 class PerceptualHashEngine:
     """Generate perceptual hashes for image/video matching"""
     
+    HASH_SIZE = 8
+    PHASH_SIZE = 32  # HASH_SIZE * imagehash's default highfreq_factor
+    
+    # Hashes of recently seen content by SHA-256, so retried or repeated
+    # uploads skip the decode entirely
+    CACHE_SIZE = 512
+    _cache: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    # Only the low-frequency HASH_SIZE x HASH_SIZE DCT block is used, so
+    # pHash is C @ pixels @ C.T with just those basis rows
+    _PHASH_BASIS = _dct_basis(PHASH_SIZE, HASH_SIZE).astype(np.float32)
+    
+    # libjpeg DCT-domain downscales, largest first
+    _JPEG_REDUCED = ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4), (2, cv2.IMREAD_REDUCED_COLOR_2))
+    
+    @classmethod
+    def _decode_rgb(cls, image_bytes: bytes) -> np.ndarray:
+        """
+        Decode to an RGB array with OpenCV, falling back to PIL (e.g. GIF)
+        
+        Large JPEGs are decoded at 1/2-1/8 scale straight from their DCT
+        coefficients, keeping the short side at least twice PHASH_SIZE.
+        """
+        flags = cv2.IMREAD_COLOR
+        size = _jpeg_size(image_bytes)
+        if size is not None:
+            for factor, reduced in cls._JPEG_REDUCED:
+                if min(size) // factor >= 2 * cls.PHASH_SIZE:
+                    flags = reduced
+                    break
+        bgr = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), flags)
+        if bgr is None:
+            return np.asarray(Image.open(io.BytesIO(image_bytes)).convert('RGB'))
+        return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+    
     @staticmethod
-    def generate_image_hashes(image_bytes: bytes) -> Dict[str, str]:
-        """Generate multiple perceptual hashes"""
+    def _bits_to_hex(bits: np.ndarray) -> str:
+        """Hex string of a boolean hash, in imagehash's bit order"""
+        return np.packbits(bits, axis=None).tobytes().hex()
+    
+    @classmethod
+    def generate_image_hashes(
+        cls,
+        image_bytes: bytes,
+        digests: Optional[Tuple[str, str]] = None
+    ) -> Dict[str, str]:
+        """
+        Generate multiple perceptual hashes
+        
+        The image is decoded once and converted to grayscale once; pHash,
+        dHash and aHash follow imagehash's algorithms on OpenCV area
+        downscales of that one buffer. ``digests`` are the (MD5, SHA-256)
+        hex digests when already computed, e.g. by ``_read_upload``.
+        Results are cached by SHA-256 for the last CACHE_SIZE images.
+        """
+        md5, sha256 = digests or _content_digests(image_bytes)
+        with cls._cache_lock:
+            cached = cls._cache.get(sha256)
+            if cached is not None:
+                cls._cache.move_to_end(sha256)
+                return dict(cached)
+        
         try:
-            img = Image.open(io.BytesIO(image_bytes))
+            rgb = cls._decode_rgb(image_bytes)
+            gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+            n = cls.HASH_SIZE
+            
+            # pHash: low-frequency 8x8 block of the 32x32 DCT vs its median
+            small = cv2.resize(gray, (cls.PHASH_SIZE, cls.PHASH_SIZE), interpolation=cv2.INTER_AREA)
+            basis = cls._PHASH_BASIS
+            low = basis @ small.astype(np.float32) @ basis.T
+            phash = low > np.median(low)
             
-            # Convert to RGB if needed
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
+            # dHash: horizontal gradient sign on a 9x8 downscale
+            small = cv2.resize(gray, (n + 1, n), interpolation=cv2.INTER_AREA)
+            dhash = small[:, 1:] > small[:, :-1]
             
-            return {
-                "phash": str(imagehash.phash(img)),
-                "dhash": str(imagehash.dhash(img)),
-                "ahash": str(imagehash.average_hash(img)),
-                "whash": str(imagehash.whash(img)),
-                "colorhash": str(imagehash.colorhash(img)),
-                "md5": hashlib.md5(image_bytes).hexdigest(),
-                "sha256": hashlib.sha256(image_bytes).hexdigest()
+            # aHash: 8x8 downscale vs its mean
+            small = cv2.resize(gray, (n, n), interpolation=cv2.INTER_AREA)
+            ahash = small > small.mean()
+            
+            hashes = {
+                "phash": cls._bits_to_hex(phash),
+                "dhash": cls._bits_to_hex(dhash),
+                "ahash": cls._bits_to_hex(ahash),
             }
+            if imagehash is not None:
+                img = Image.fromarray(rgb)
+                hashes["whash"] = str(imagehash.whash(img))
+                hashes["colorhash"] = str(imagehash.colorhash(img))
+            
+            hashes["md5"], hashes["sha256"] = md5, sha256
         except Exception as e:
             logger.error(f"Hash generation error: {str(e)}")
             return {}
+        
+        with cls._cache_lock:
+            cls._cache[sha256] = hashes
+            if len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return dict(hashes)
     
     @staticmethod
     def compare_hashes(hash1: str, hash2: str, threshold: int = 10) -> bool:
-        """Compare two perceptual hashes"""
+        """Compare two perceptual hashes by Hamming distance"""
+        # Hashes of different sizes are not comparable
+        if len(hash1) != len(hash2):
+            return False
         try:
-            h1 = imagehash.hex_to_hash(hash1)
-            h2 = imagehash.hex_to_hash(hash2)
-            distance = h1 - h2
-            return distance <= threshold
-        except:
+            return (int(hash1, 16) ^ int(hash2, 16)).bit_count() <= threshold
+        except (TypeError, ValueError):
             return False
 
 
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def _popcount64(x: np.ndarray) -> np.ndarray:
+    """Set bits per element of a uint64 array (SWAR unless NumPy has bitwise_count)"""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    x = x - ((x >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return ((x * _H01) >> np.uint64(56)).astype(np.uint8)
+
+
+class PerceptualHashIndex:
+    """
+    64-bit perceptual hashes packed into a uint64 array
+    
+    Holds one column per hash kind, each hash parsed once when added, so
+    matching a query is one vectorized XOR and popcount over the stored
+    column instead of a compare_hashes call per stored hash. The scan is
+    exhaustive, so every hash within the threshold is found.
+    """
+    
+    KINDS = ("phash", "dhash", "ahash")
+    
+    def __init__(self, capacity: int = 1024):
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._hashes = np.empty((capacity, len(self.KINDS)), dtype=np.uint64)
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    @classmethod
+    def _pack(cls, hashes: Dict[str, str]) -> np.ndarray:
+        return np.array([int(hashes[kind], 16) for kind in cls.KINDS], dtype=np.uint64)
+    
+    def add(self, key: str, hashes: Dict[str, str]) -> None:
+        """Index the 16-hex-digit pHash/dHash/aHash of ``hashes`` under ``key``"""
+        row = self._pack(hashes)
+        size = len(self._keys)
+        if size == len(self._hashes):
+            grown = np.empty((max(2 * size, 1), len(self.KINDS)), dtype=np.uint64)
+            grown[:size] = self._hashes
+            self._hashes = grown
+        self._hashes[size] = row
+        self._keys.append(key)
+        self._rows[key] = size
+    
+    def discard(self, key: str) -> None:
+        """Drop ``key`` from the index, moving the last row into its slot"""
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        last = len(self._keys) - 1
+        if row != last:
+            moved = self._keys[last]
+            self._hashes[row] = self._hashes[last]
+            self._keys[row] = moved
+            self._rows[moved] = row
+        self._keys.pop()
+    
+    def search(
+        self,
+        hashes: Dict[str, str],
+        threshold: int = 10,
+        kind: str = "phash",
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, Dict[str, int]]]:
+        """
+        Indexed entries whose ``kind`` hash is within ``threshold`` of the query
+        
+        Returns (key, Hamming distance per kind), nearest first, at most
+        ``limit`` of them.
+        """
+        query = self._pack(hashes)
+        column = self.KINDS.index(kind)
+        stored = self._hashes[:len(self._keys)]
+        kind_distances = _popcount64(stored[:, column] ^ query[column])
+        hits = np.flatnonzero(kind_distances <= threshold)
+        if limit is not None and limit < len(hits):
+            # Top-k without sorting every hit; ties at the cut are arbitrary
+            hits = np.sort(hits[np.argpartition(kind_distances[hits], limit - 1)[:limit]])
+        hits = hits[np.argsort(kind_distances[hits], kind="stable")]
+        distances = _popcount64(stored[hits] ^ query)
+        return [
+            (self._keys[row], dict(zip(self.KINDS, row_distances)))
+            for row, row_distances in zip(hits.tolist(), distances.tolist())
+        ]
+
+
+_HASH_ENGINE = PerceptualHashEngine()
+
+# Registered fingerprints (in production: the database) and their hash index,
+# oldest first; registering past the cap evicts the oldest fingerprint
+MAX_FINGERPRINTS = 100_000
+_fingerprints: Dict[str, Dict[str, Any]] = {}
+_hash_index = PerceptualHashIndex()
+
+# Most fingerprint matches returned for one query, nearest first
+MAX_MATCHES = 100
+
+
+async def _gather_sources(calls: Dict[str, Awaitable[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Await independent engine/platform lookups concurrently
+
+    A failing source is logged and reported as failed rather than aborting
+    the others. Results keep the order of ``calls``.
+    """
+    outcomes = await asyncio.gather(*calls.values(), return_exceptions=True)
+    results = {}
+    for name, outcome in zip(calls, outcomes):
+        if isinstance(outcome, BaseException):
+            if not isinstance(outcome, Exception):
+                raise outcome
+            logger.warning(f"{name} lookup failed: {outcome}")
+            outcome = {"status": "failed", "error": str(outcome)}
+        results[name] = outcome
+    return results
+
+
 # ============================================================================
 # REVERSE IMAGE SEARCH ENGINE
 # ============================================================================
@@ -115,12 +423,12 @@ async def reverse_search_image(
     try:
         search_id = str(uuid.uuid4())
         
-        # Read image
-        image_bytes = await file.read()
+        # Read image, hashing it as it streams in
+        image_bytes, digests = await _read_upload(file)
         
         # Generate perceptual hashes
-        hash_engine = PerceptualHashEngine()
-        hashes = hash_engine.generate_image_hashes(image_bytes)
+        hash_engine = _HASH_ENGINE
+        hashes = hash_engine.generate_image_hashes(image_bytes, digests)
         
         results = {
             "search_id": search_id,
@@ -129,28 +437,26 @@ async def reverse_search_image(
             "found_urls": [],
             "total_matches": 0
         }
-        
-        # Google Reverse Image Search
-        if "google" in search_engines:
-            google_results = await _search_google_images(image_bytes)
-            results["search_engines"]["google"] = google_results
-            results["found_urls"].extend(google_results.get("urls", []))
-        
-        # Yandex Reverse Image Search
-        if "yandex" in search_engines:
-            yandex_results = await _search_yandex_images(image_bytes)
-            results["search_engines"]["yandex"] = yandex_results
-            results["found_urls"].extend(yandex_results.get("urls", []))
-        
-        # TinEye
-        if "tineye" in search_engines:
-            tineye_results = await _search_tineye(image_bytes)
-            results["search_engines"]["tineye"] = tineye_results
-            results["found_urls"].extend(tineye_results.get("urls", []))
-        
-        # Remove duplicates
-        results["found_urls"] = list(set(results["found_urls"]))
-        results["total_matches"] = len(results["found_urls"])
+        # Ordered set of URLs across engines, in first-seen order
+        found_urls: Dict[str, None] = {}
+        
+        # Query Google, Yandex and TinEye concurrently
+        session = _http()
+        engines = (
+            ("google", _search_google_images),
+            ("yandex", _search_yandex_images),
+            ("tineye", _search_tineye),
+        )
+        results["search_engines"] = await _gather_sources({
+            name: search(image_bytes, session)
+            for name, search in engines
+            if name in search_engines
+        })
+        for engine_results in results["search_engines"].values():
+            found_urls.update(dict.fromkeys(engine_results.get("urls", ())))
+        
+        results["found_urls"] = list(found_urls)
+        results["total_matches"] = len(found_urls)
         
         return {
             "success": True,
@@ -162,7 +468,7 @@ async def reverse_search_image(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def _search_google_images(image_bytes: bytes) -> Dict[str, Any]:
+async def _search_google_images(image_bytes: bytes, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """Search Google Images (placeholder - requires Google Custom Search API)"""
     # In production, use Google Custom Search API
     return {
@@ -175,7 +481,7 @@ async def _search_google_images(image_bytes: bytes) -> Dict[str, Any]:
     }
 
 
-async def _search_yandex_images(image_bytes: bytes) -> Dict[str, Any]:
+async def _search_yandex_images(image_bytes: bytes, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """Search Yandex Images"""
     return {
         "engine": "Yandex Images",
@@ -185,7 +491,7 @@ async def _search_yandex_images(image_bytes: bytes) -> Dict[str, Any]:
     }
 
 
-async def _search_tineye(image_bytes: bytes) -> Dict[str, Any]:
+async def _search_tineye(image_bytes: bytes, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """Search TinEye"""
     return {
         "engine": "TinEye",
@@ -219,41 +525,23 @@ async def scan_social_media_platforms(
             "total_matches": 0
         }
         
-        # YouTube scan
-        if "youtube" in request.platforms:
-            youtube_results = await _scan_youtube(request)
-            results["platforms"]["youtube"] = youtube_results
-            results["found_content"].extend(youtube_results.get("matches", []))
-        
-        # Instagram scan
-        if "instagram" in request.platforms:
-            instagram_results = await _scan_instagram(request)
-            results["platforms"]["instagram"] = instagram_results
-            results["found_content"].extend(instagram_results.get("matches", []))
-        
-        # Facebook scan
-        if "facebook" in request.platforms:
-            facebook_results = await _scan_facebook(request)
-            results["platforms"]["facebook"] = facebook_results
-            results["found_content"].extend(facebook_results.get("matches", []))
-        
-        # Twitter/X scan
-        if "twitter" in request.platforms:
-            twitter_results = await _scan_twitter(request)
-            results["platforms"]["twitter"] = twitter_results
-            results["found_content"].extend(twitter_results.get("matches", []))
-        
-        # Telegram scan
-        if "telegram" in request.platforms:
-            telegram_results = await _scan_telegram(request)
-            results["platforms"]["telegram"] = telegram_results
-            results["found_content"].extend(telegram_results.get("matches", []))
-        
-        # Adult sites scan (if authorized)
-        if "adult_sites" in request.platforms:
-            adult_site_results = await _scan_adult_sites(request)
-            results["platforms"]["adult_sites"] = adult_site_results
-            results["found_content"].extend(adult_site_results.get("matches", []))
+        # Scan the requested platforms concurrently (adult sites only if authorized)
+        session = _http()
+        scanners = (
+            ("youtube", _scan_youtube),
+            ("instagram", _scan_instagram),
+            ("facebook", _scan_facebook),
+            ("twitter", _scan_twitter),
+            ("telegram", _scan_telegram),
+            ("adult_sites", _scan_adult_sites),
+        )
+        results["platforms"] = await _gather_sources({
+            name: scan(request, session)
+            for name, scan in scanners
+            if name in request.platforms
+        })
+        for platform_results in results["platforms"].values():
+            results["found_content"].extend(platform_results.get("matches", []))
         
         results["total_matches"] = len(results["found_content"])
         results["completed_at"] = datetime.utcnow().isoformat()
@@ -268,7 +556,7 @@ async def scan_social_media_platforms(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def _scan_youtube(request: ReverseSearchRequest) -> Dict[str, Any]:
+async def _scan_youtube(request: ReverseSearchRequest, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """Scan YouTube for matching content"""
     # In production: Use YouTube Data API
     return {
@@ -292,7 +580,7 @@ async def _scan_youtube(request: ReverseSearchRequest) -> Dict[str, Any]:
     }
 
 
-async def _scan_instagram(request: ReverseSearchRequest) -> Dict[str, Any]:
+async def _scan_instagram(request: ReverseSearchRequest, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """Scan Instagram for matching content"""
     return {
         "platform": "Instagram",
@@ -303,7 +591,7 @@ async def _scan_instagram(request: ReverseSearchRequest) -> Dict[str, Any]:
     }
 
 
-async def _scan_facebook(request: ReverseSearchRequest) -> Dict[str, Any]:
+async def _scan_facebook(request: ReverseSearchRequest, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """Scan Facebook for matching content"""
     return {
         "platform": "Facebook",
@@ -314,7 +602,7 @@ async def _scan_facebook(request: ReverseSearchRequest) -> Dict[str, Any]:
     }
 
 
-async def _scan_twitter(request: ReverseSearchRequest) -> Dict[str, Any]:
+async def _scan_twitter(request: ReverseSearchRequest, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """Scan Twitter/X for matching content"""
     return {
         "platform": "Twitter/X",
@@ -325,7 +613,7 @@ async def _scan_twitter(request: ReverseSearchRequest) -> Dict[str, Any]:
     }
 
 
-async def _scan_telegram(request: ReverseSearchRequest) -> Dict[str, Any]:
+async def _scan_telegram(request: ReverseSearchRequest, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """Scan Telegram for matching content"""
     return {
         "platform": "Telegram",
@@ -336,7 +624,7 @@ async def _scan_telegram(request: ReverseSearchRequest) -> Dict[str, Any]:
     }
 
 
-async def _scan_adult_sites(request: ReverseSearchRequest) -> Dict[str, Any]:
+async def _scan_adult_sites(request: ReverseSearchRequest, session: aiohttp.ClientSession) -> Dict[str, Any]:
     """Scan adult content platforms (authorized law enforcement only)"""
     return {
         "platform": "Adult Content Sites",
@@ -533,12 +821,12 @@ async def register_content_fingerprint(
     try:
         fingerprint_id = str(uuid.uuid4())
         
-        # Read file
-        file_bytes = await file.read()
+        # Read file, hashing it as it streams in
+        file_bytes, digests = await _read_upload(file)
         
         # Generate hashes
-        hash_engine = PerceptualHashEngine()
-        hashes = hash_engine.generate_image_hashes(file_bytes)
+        hash_engine = _HASH_ENGINE
+        hashes = hash_engine.generate_image_hashes(file_bytes, digests)
         
         fingerprint_record = {
             "fingerprint_id": fingerprint_id,
@@ -551,6 +839,13 @@ async def register_content_fingerprint(
         }
         
         # In production: Store in database
+        while len(_fingerprints) >= MAX_FINGERPRINTS:
+            evicted = next(iter(_fingerprints))
+            del _fingerprints[evicted]
+            _hash_index.discard(evicted)
+        _fingerprints[fingerprint_id] = fingerprint_record
+        if all(kind in hashes for kind in PerceptualHashIndex.KINDS):
+            _hash_index.add(fingerprint_id, hashes)
         
         return {
             "success": True,
@@ -573,24 +868,30 @@ async def match_content_fingerprint(
     Match uploaded content against fingerprint database
     """
     try:
-        # Read file
-        file_bytes = await file.read()
+        # Read file, hashing it as it streams in
+        file_bytes, digests = await _read_upload(file)
         
         # Generate hashes
-        hash_engine = PerceptualHashEngine()
-        query_hashes = hash_engine.generate_image_hashes(file_bytes)
+        hash_engine = _HASH_ENGINE
+        query_hashes = hash_engine.generate_image_hashes(file_bytes, digests)
         
         # In production: Query database for similar hashes
-        matches = [
-            {
-                "fingerprint_id": "fp-123",
-                "similarity_score": 0.98,
-                "match_type": "exact",
-                "original_owner": "user@example.com",
-                "registered_date": "2025-11-15",
-                "content_type": "original"
-            }
-        ]
+        matches = []
+        if all(kind in query_hashes for kind in PerceptualHashIndex.KINDS):
+            for fingerprint_id, distances in _hash_index.search(query_hashes, limit=MAX_MATCHES):
+                record = _fingerprints[fingerprint_id]
+                match = {
+                    "fingerprint_id": fingerprint_id,
+                    "similarity_score": round(1 - distances["phash"] / 64, 4),
+                    "match_type": "exact" if not any(distances.values()) else "near_duplicate",
+                    "hamming_distances": distances,
+                    "registered_date": record["registered_at"],
+                    "content_type": record["content_type"]
+                }
+                # Only reveal who registered a fingerprint to that user
+                if record["user_id"] == current_user.id:
+                    match["original_owner"] = record["user_id"]
+                matches.append(match)
         
         return {
             "success": True,
@@ -0,0 +1,126 @@
+"""Tests for the crawler's vectorized perceptual-hash index"""
+
+import random
+
+import numpy as np
+import pytest
+
+from app.api.crawler.router import PerceptualHashIndex, _popcount64
+
+
+def _hashes(phash: int, dhash: int = 0, ahash: int = 0):
+    return {"phash": f"{phash:016x}", "dhash": f"{dhash:016x}", "ahash": f"{ahash:016x}"}
+
+
+def _flip(value: int, bits: int) -> int:
+    """``value`` with its ``bits`` lowest bits inverted"""
+    return value ^ ((1 << bits) - 1)
+
+
+# ============================================================================
+# _popcount64
+# ============================================================================
+
+POPCOUNT_VALUES = [0, 1, 0xFF, 0x8000000000000000, 0xFFFFFFFFFFFFFFFF, 0x5555555555555555] + [
+    random.Random(7).getrandbits(64) for _ in range(64)
+]
+
+
+def test_popcount64_counts_set_bits():
+    counts = _popcount64(np.array(POPCOUNT_VALUES, dtype=np.uint64))
+
+    assert counts.tolist() == [value.bit_count() for value in POPCOUNT_VALUES]
+
+
+def test_popcount64_swar_fallback_matches(monkeypatch):
+    monkeypatch.delattr(np, "bitwise_count", raising=False)
+
+    counts = _popcount64(np.array(POPCOUNT_VALUES, dtype=np.uint64))
+
+    assert counts.tolist() == [value.bit_count() for value in POPCOUNT_VALUES]
+
+
+# ============================================================================
+# PerceptualHashIndex.search
+# ============================================================================
+
+def test_search_returns_matches_within_threshold_nearest_first():
+    base = 0x0123456789ABCDEF
+    index = PerceptualHashIndex()
+    index.add("far", _hashes(_flip(base, 20)))
+    index.add("near", _hashes(_flip(base, 3), dhash=1))
+    index.add("exact", _hashes(base))
+    index.add("edge", _hashes(_flip(base, 10)))
+
+    matches = index.search(_hashes(base), threshold=10)
+
+    assert [key for key, _ in matches] == ["exact", "near", "edge"]
+    assert matches[0][1] == {"phash": 0, "dhash": 0, "ahash": 0}
+    assert matches[1][1] == {"phash": 3, "dhash": 1, "ahash": 0}
+
+
+def test_search_finds_every_hash_a_brute_force_scan_finds():
+    rng = random.Random(42)
+    query = rng.getrandbits(64)
+    stored = {
+        f"fp{i}": _flip(query, rng.randrange(0, 64)) if i % 3 else rng.getrandbits(64)
+        for i in range(2000)
+    }
+    index = PerceptualHashIndex(capacity=16)
+    for key, value in stored.items():
+        index.add(key, _hashes(value))
+
+    matches = index.search(_hashes(query), threshold=12)
+
+    expected = {key for key, value in stored.items() if (value ^ query).bit_count() <= 12}
+    assert {key for key, _ in matches} == expected
+    distances = [d["phash"] for _, d in matches]
+    assert distances == sorted(distances)
+
+
+def test_search_limit_keeps_the_nearest():
+    index = PerceptualHashIndex()
+    for bits in (9, 1, 7, 3, 5):
+        index.add(f"d{bits}", _hashes(_flip(0, bits)))
+
+    matches = index.search(_hashes(0), threshold=10, limit=2)
+
+    assert [key for key, _ in matches] == ["d1", "d3"]
+
+
+def test_search_by_another_kind():
+    index = PerceptualHashIndex()
+    index.add("a", _hashes(0, dhash=_flip(0, 2)))
+    index.add("b", _hashes(0, dhash=_flip(0, 30)))
+
+    matches = index.search(_hashes(0), threshold=5, kind="dhash")
+
+    assert [key for key, _ in matches] == ["a"]
+
+
+def test_search_empty_index():
+    assert PerceptualHashIndex().search(_hashes(0)) == []
+
+
+def test_discard_keeps_the_remaining_keys_matched_to_their_hashes():
+    index = PerceptualHashIndex()
+    for bits in range(4):
+        index.add(f"d{bits}", _hashes(_flip(0, bits)))
+
+    index.discard("d1")
+    index.discard("missing")
+
+    assert len(index) == 3
+    assert index.search(_hashes(0), threshold=64) == [
+        ("d0", {"phash": 0, "dhash": 0, "ahash": 0}),
+        ("d2", {"phash": 2, "dhash": 0, "ahash": 0}),
+        ("d3", {"phash": 3, "dhash": 0, "ahash": 0}),
+    ]
+
+
+@pytest.mark.parametrize("kind", PerceptualHashIndex.KINDS)
+def test_search_rejects_nothing_at_full_threshold(kind):
+    index = PerceptualHashIndex()
+    index.add("all-ones", _hashes(2**64 - 1, 2**64 - 1, 2**64 - 1))
+
+    assert [key for key, _ in index.search(_hashes(0), threshold=64, kind=kind)] == ["all-ones"]
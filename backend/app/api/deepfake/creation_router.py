@@ -4,81 +4,80 @@ Real implementations for face-swap, age transformation, gender-swap, etc.
 """
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from fastapi.responses import FileResponse
-import aiofiles
+from fastapi.responses import FileResponse, Response
 import os
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import functools
 import logging
+import threading
 import uuid
 import cv2
 import numpy as np
 
+from app.core.config import settings
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Upload directory
-UPLOAD_DIR = Path("/tmp/deepfake_creation")
-UPLOAD_DIR.mkdir(exist_ok=True)
-
 OUTPUT_DIR = Path("/tmp/deepfake_outputs")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Recent results are served from memory; older ones from OUTPUT_DIR.
+# Only touched from the event loop, so no lock.
+RESULT_CACHE_SIZE = 64
+_result_cache: "OrderedDict[str, bytes]" = OrderedDict()
+
+# Progressive JPEG at quality 85 for results
+JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 85, cv2.IMWRITE_JPEG_PROGRESSIVE, 1]
+
+
+def _result_path(session_id: str) -> Path:
+    """On-disk location of a session's result JPEG"""
+    return OUTPUT_DIR / f"result_{session_id}.jpg"
+
 
 @router.post("/create")
 async def create_deepfake(
     tool: str = Form(...),
     source: UploadFile = File(...),
-    target: Optional[UploadFile] = File(None)
+    target: Optional[UploadFile] = File(None),
+    quality: str = Form("fast")
 ):
     """
     Create deepfake using specified tool
     
     Tools:
-    - face-swap: Swap faces between source and target
+    - face-swap: Swap faces between source and target; quality "fast"
+      (feathered blend) or "high" (Poisson seamless clone)
     - age-transform: Age progression/regression
     - gender-swap: Change gender in face
-    - face-enhance: Enhance face quality (GFPGAN)
+    - face-enhance: Enhance face quality (GFPGAN); quality "fast"
+      (bilateral denoise) or "high" (non-local means)
     - lip-sync: Sync lips to audio
     - face-animate: Animate still image
     """
     try:
-        session_id = str(uuid.uuid4())
+        if tool not in TOOLS:
+            raise HTTPException(status_code=400, detail=f"Unknown tool: {tool}")
         
-        # Save source file
-        source_ext = os.path.splitext(source.filename)[1]
-        source_path = UPLOAD_DIR / f"source_{session_id}{source_ext}"
-        async with aiofiles.open(source_path, 'wb') as f:
-            content = await source.read()
-            await f.write(content)
+        session_id = str(uuid.uuid4())
         
-        # Save target file if provided
-        target_path = None
-        if target:
-            target_ext = os.path.splitext(target.filename)[1]
-            target_path = UPLOAD_DIR / f"target_{session_id}{target_ext}"
-            async with aiofiles.open(target_path, 'wb') as f:
-                content = await target.read()
-                await f.write(content)
+        # Uploads are decoded from memory; only the result touches disk
+        source_bytes = await source.read()
+        target_bytes = await target.read() if target else None
         
-        # Process based on tool
-        output_path = OUTPUT_DIR / f"result_{session_id}.jpg"
+        # Process based on tool. The tools are blocking OpenCV code; run
+        # them off the event loop
+        output_path = _result_path(session_id)
+        result_bytes = await asyncio.to_thread(_run_tool, tool, source_bytes, target_bytes, quality, output_path)
         
-        if tool == "face-swap":
-            result_path = await face_swap(str(source_path), str(target_path))
-        elif tool == "age-transform":
-            result_path = await age_transform(str(source_path))
-        elif tool == "gender-swap":
-            result_path = await gender_swap(str(source_path))
-        elif tool == "face-enhance":
-            result_path = await face_enhance(str(source_path))
-        elif tool == "lip-sync":
-            result_path = await lip_sync(str(source_path), str(target_path))
-        elif tool == "face-animate":
-            result_path = await face_animate(str(source_path))
-        else:
-            raise HTTPException(status_code=400, detail=f"Unknown tool: {tool}")
+        _result_cache[session_id] = result_bytes
+        if len(_result_cache) > RESULT_CACHE_SIZE:
+            _result_cache.popitem(last=False)
         
         return {
             "success": True,
@@ -87,6 +86,8 @@ async def create_deepfake(
             "result_url": f"/api/v1/deepfake/download/{session_id}"
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Deepfake creation error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Creation failed: {str(e)}")
@@ -95,7 +96,12 @@ async def create_deepfake(
 @router.get("/download/{session_id}")
 async def download_result(session_id: str):
     """Download the created deepfake result"""
-    result_path = OUTPUT_DIR / f"result_{session_id}.jpg"
+    cached = _result_cache.get(session_id)
+    if cached is not None:
+        _result_cache.move_to_end(session_id)
+        return Response(content=cached, media_type="image/jpeg")
+    
+    result_path = _result_path(session_id)
     
     if not result_path.exists():
         raise HTTPException(status_code=404, detail="Result not found")
@@ -104,32 +110,188 @@ async def download_result(session_id: str):
 
 
 # ============================================================================
-# TOOL IMPLEMENTATIONS
+# FACE DETECTION
 # ============================================================================
 
-async def face_swap(source_path: str, target_path: str) -> str:
-    """
-    Face swap using OpenCV DNN face detection + seamless cloning
+# Longest side of the image the detector sees; boxes are scaled back up.
+# Tool inputs are at most MAX_PROCESS_SIDE, so this halves them at most and
+# a face needs to be about 48 px across at full size to be found
+FACE_DETECT_SIZE = 640
+
+# Fallback detector bundled with opencv-python
+HAAR_FACE_CASCADE_PATH = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+
+# Neither YuNet (which keeps its input size as state) nor a
+# CascadeClassifier is safe to share between threads; each tool thread
+# loads its own
+_detector_local = threading.local()
+_cascade_local = threading.local()
+
+
+@functools.lru_cache(maxsize=1)
+def _yunet_model_path() -> Optional[str]:
+    """YuNet model file, or None (logged once) when it is not installed"""
+    model_path = settings.FACE_DETECTOR_MODEL_PATH
+    if hasattr(cv2, "FaceDetectorYN") and os.path.exists(model_path):
+        return model_path
+    logger.warning(f"YuNet model not found at {model_path}; using Haar cascade face detection")
+    return None
+
+
+def _face_detector():
     """
-    if not target_path:
-        raise HTTPException(status_code=400, detail="Target image required for face swap")
-    
-    # Load images
-    source_img = cv2.imread(source_path)
-    target_img = cv2.imread(target_path)
+    This thread's YuNet (OpenCV DNN) face detector, loaded on first use
     
-    if source_img is None or target_img is None:
-        raise HTTPException(status_code=400, detail="Failed to load images")
+    None when its model file is not installed; detect_faces then falls
+    back to the bundled Haar cascade.
+    """
+    model_path = _yunet_model_path()
+    if model_path is None:
+        return None
+    detector = getattr(_detector_local, "detector", None)
+    if detector is None:
+        detector = _detector_local.detector = cv2.FaceDetectorYN.create(
+            model_path, "", (FACE_DETECT_SIZE, FACE_DETECT_SIZE),
+            score_threshold=0.8,
+            backend_id=cv2.dnn.DNN_BACKEND_OPENCV,
+            target_id=cv2.dnn.DNN_TARGET_CPU,
+        )
+    return detector
+
+
+def _face_cascade() -> cv2.CascadeClassifier:
+    """This thread's Haar face cascade, loaded on first use"""
+    cascade = getattr(_cascade_local, "cascade", None)
+    if cascade is None:
+        cascade = _cascade_local.cascade = cv2.CascadeClassifier(HAAR_FACE_CASCADE_PATH)
+    return cascade
+
+
+def detect_faces(img: np.ndarray) -> List[Tuple[int, int, int, int]]:
+    """
+    Detect faces in a BGR image
     
-    # Load face detector
-    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    Runs on a copy downscaled to at most FACE_DETECT_SIZE on its longest
+    side and returns (x, y, w, h) boxes in full-resolution pixels.
+    """
+    height, width = img.shape[:2]
+    scale = min(1.0, FACE_DETECT_SIZE / max(height, width))
+    small = img if scale == 1.0 else cv2.resize(
+        img, (max(1, round(width * scale)), max(1, round(height * scale))),
+        interpolation=cv2.INTER_AREA
+    )
+    
+    detector = _face_detector()
+    if detector is None:
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        boxes = np.asarray(_face_cascade().detectMultiScale(gray, 1.1, 5), dtype=np.float32).reshape(-1, 4)
+    else:
+        detector.setInputSize((small.shape[1], small.shape[0]))
+        _, faces = detector.detect(small)
+        boxes = np.empty((0, 4), np.float32) if faces is None else faces[:, :4]
+    
+    boxes = np.round(boxes / scale).astype(int)
+    # Clip to the image so callers can slice with the boxes directly
+    x = np.clip(boxes[:, 0], 0, width - 1)
+    y = np.clip(boxes[:, 1], 0, height - 1)
+    w = np.minimum(boxes[:, 0] + boxes[:, 2], width) - x
+    h = np.minimum(boxes[:, 1] + boxes[:, 3], height) - y
+    keep = (w > 0) & (h > 0)
+    return [tuple(box) for box in np.stack([x, y, w, h], axis=1)[keep].tolist()]
+
+
+# ============================================================================
+# TOOL IMPLEMENTATIONS
+# ============================================================================
+
+TOOLS = ("face-swap", "age-transform", "gender-swap", "face-enhance", "lip-sync", "face-animate")
+
+# Tools run at most at this size (long side); results are scaled back up
+MAX_PROCESS_SIDE = 1280
+
+
+def _decode_image(data: bytes) -> Optional[np.ndarray]:
+    """Decode uploaded image bytes to BGR, or None if they are not an image"""
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+
+def _fit(img: np.ndarray, max_side: int = MAX_PROCESS_SIDE) -> np.ndarray:
+    """Downscale ``img`` so its long side is at most ``max_side``"""
+    height, width = img.shape[:2]
+    scale = max_side / max(height, width)
+    if scale >= 1.0:
+        return img
+    return cv2.resize(img, (round(width * scale), round(height * scale)), interpolation=cv2.INTER_AREA)
+
+
+def _run_tool(
+    tool: str,
+    source_bytes: bytes,
+    target_bytes: Optional[bytes],
+    quality: str,
+    output_path: Path
+) -> bytes:
+    """Decode the uploads, apply ``tool``, write the JPEG result and return its bytes"""
+    if tool == "face-swap":
+        if not target_bytes:
+            raise HTTPException(status_code=400, detail="Target image required for face swap")
+        source_img = _decode_image(source_bytes)
+        target_img = _decode_image(target_bytes)
+        if source_img is None or target_img is None:
+            raise HTTPException(status_code=400, detail="Failed to load images")
+        out_size = target_img.shape[1::-1]
+        result = face_swap(_fit(source_img), _fit(target_img), quality)
+    else:
+        if tool == "lip-sync" and not target_bytes:
+            raise HTTPException(status_code=400, detail="Audio file required for lip sync")
+        img = _decode_image(source_bytes)
+        if img is None:
+            raise HTTPException(status_code=400, detail="Failed to load image")
+        out_size = img.shape[1::-1]
+        img = _fit(img)
+        if tool == "age-transform":
+            result = age_transform(img)
+        elif tool == "gender-swap":
+            result = gender_swap(img)
+        elif tool == "face-enhance":
+            result = face_enhance(img, quality)
+        elif tool == "lip-sync":
+            result = lip_sync(img, target_bytes)
+        else:
+            result = face_animate(img)
+    
+    if result.shape[1::-1] != out_size:
+        result = cv2.resize(result, out_size, interpolation=cv2.INTER_LANCZOS4)
+    ok, buf = cv2.imencode('.jpg', result, JPEG_PARAMS)
+    if not ok:
+        raise RuntimeError("Failed to encode result image")
+    result_bytes = buf.tobytes()
+    # Kept on disk for results evicted from the cache (and other workers)
+    output_path.write_bytes(result_bytes)
+    return result_bytes
+
+
+@functools.lru_cache(maxsize=64)
+def _feather_mask(width: int, height: int) -> np.ndarray:
+    """Float32 blend weights: a filled ellipse with Gaussian-softened edges (read-only)"""
+    mask = np.zeros((height, width), np.float32)
+    axes = (max(1, width // 2 - 4), max(1, height // 2 - 4))
+    cv2.ellipse(mask, (width // 2, height // 2), axes, 0, 0, 360, 1, -1)
+    mask = cv2.GaussianBlur(mask, (31, 31), 0)
+    mask.flags.writeable = False
+    return mask
+
+
+def face_swap(source_img: np.ndarray, target_img: np.ndarray, quality: str = "fast") -> np.ndarray:
+    """
+    Face swap using OpenCV DNN face detection + seamless cloning
     
+    The default "fast" quality alpha-blends the face through a feathered
+    elliptical mask; "high" solves the Poisson seamless clone.
+    """
     # Detect faces
-    source_gray = cv2.cvtColor(source_img, cv2.COLOR_BGR2GRAY)
-    target_gray = cv2.cvtColor(target_img, cv2.COLOR_BGR2GRAY)
-    
-    source_faces = face_cascade.detectMultiScale(source_gray, 1.1, 5)
-    target_faces = face_cascade.detectMultiScale(target_gray, 1.1, 5)
+    source_faces = detect_faces(source_img)
+    target_faces = detect_faces(target_img)
     
     if len(source_faces) == 0 or len(target_faces) == 0:
         raise HTTPException(status_code=400, detail="No faces detected in images")
@@ -144,6 +306,14 @@ async def face_swap(source_path: str, target_path: str) -> str:
     # Resize to target face size
     source_face_resized = cv2.resize(source_face, (tw, th))
     
+    if quality != "high":
+        # Feathered blend of the source face over the target face region
+        mask = _feather_mask(tw, th)
+        result = target_img.copy()
+        roi = result[ty:ty+th, tx:tx+tw]
+        roi[...] = cv2.blendLinear(source_face_resized, roi, mask, 1.0 - mask)
+        return result
+    
     # Create mask for seamless cloning
     mask = 255 * np.ones(source_face_resized.shape, source_face_resized.dtype)
     
@@ -158,64 +328,53 @@ async def face_swap(source_path: str, target_path: str) -> str:
         result = target_img.copy()
         result[ty:ty+th, tx:tx+tw] = source_face_resized
     
-    # Save result
-    session_id = os.path.basename(source_path).split('_')[1].split('.')[0]
-    output_path = OUTPUT_DIR / f"result_{session_id}.jpg"
-    cv2.imwrite(str(output_path), result)
-    
-    return str(output_path)
+    return result
+
+
+# age_transform's L-channel darkening (alpha 0.85, beta -10, as convertScaleAbs)
+# as a 3-channel LUT that leaves the a/b channels untouched
+_AGE_LAB_LUT = np.dstack([
+    cv2.convertScaleAbs(np.arange(256, dtype=np.uint8), alpha=0.85, beta=-10).reshape(1, 256),
+    np.arange(256, dtype=np.uint8).reshape(1, 256),
+    np.arange(256, dtype=np.uint8).reshape(1, 256),
+])
 
+# Sepia tone matrix applied to BGR pixels. Keep it float32: cv2.transform
+# reads the coefficients literally and saturates straight back to uint8, so
+# a x256 fixed-point integer matrix would over-brighten, and it is slower
+_SEPIA_KERNEL = np.array([[0.272, 0.534, 0.131],
+                          [0.349, 0.686, 0.168],
+                          [0.393, 0.769, 0.189]], dtype=np.float32)
 
-async def age_transform(source_path: str) -> str:
+
+def age_transform(img: np.ndarray) -> np.ndarray:
     """
     Age transformation (aging effect)
     Applies color grading and texture changes to simulate aging
+    (overwrites ``img``)
     """
-    img = cv2.imread(source_path)
-    if img is None:
-        raise HTTPException(status_code=400, detail="Failed to load image")
-    
-    # Convert to LAB color space
+    # Age effect: reduce brightness, increase contrast (L channel only,
+    # in place, so no split/merge copies)
     lab = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
-    l, a, b = cv2.split(lab)
-    
-    # Age effect: reduce brightness, increase contrast
-    l = cv2.convertScaleAbs(l, alpha=0.85, beta=-10)
-    
-    # Merge and convert back
-    aged = cv2.merge([l, a, b])
-    aged = cv2.cvtColor(aged, cv2.COLOR_LAB2BGR)
+    cv2.LUT(lab, _AGE_LAB_LUT, dst=lab)
+    aged = cv2.cvtColor(lab, cv2.COLOR_LAB2BGR, dst=img)
     
     # Add sepia tone for aged look
-    kernel = np.array([[0.272, 0.534, 0.131],
-                       [0.349, 0.686, 0.168],
-                       [0.393, 0.769, 0.189]])
-    aged = cv2.transform(aged, kernel)
+    cv2.transform(aged, _SEPIA_KERNEL, dst=aged)
     
     # Add slight blur to simulate wrinkles
     aged = cv2.GaussianBlur(aged, (3, 3), 0)
     
-    # Save
-    session_id = os.path.basename(source_path).split('_')[1].split('.')[0]
-    output_path = OUTPUT_DIR / f"result_{session_id}.jpg"
-    cv2.imwrite(str(output_path), aged)
-    
-    return str(output_path)
+    return aged
 
 
-async def gender_swap(source_path: str) -> str:
+def gender_swap(img: np.ndarray) -> np.ndarray:
     """
     Gender swap effect
     Applies facial feature adjustments
     """
-    img = cv2.imread(source_path)
-    if img is None:
-        raise HTTPException(status_code=400, detail="Failed to load image")
-    
     # Detect face
-    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    faces = face_cascade.detectMultiScale(gray, 1.1, 5)
+    faces = detect_faces(img)
     
     if len(faces) == 0:
         raise HTTPException(status_code=400, detail="No face detected")
@@ -237,104 +396,83 @@ async def gender_swap(source_path: str) -> str:
         # Put back
         result[y:y+h, x:x+w] = face_adjusted
     
-    # Save
-    session_id = os.path.basename(source_path).split('_')[1].split('.')[0]
-    output_path = OUTPUT_DIR / f"result_{session_id}.jpg"
-    cv2.imwrite(str(output_path), result)
-    
-    return str(output_path)
+    return result
+
+
+def _denoise(img: np.ndarray, quality: str) -> np.ndarray:
+    """Edge-preserving denoise: bilateral by default, non-local means for "high" """
+    if quality == "high":
+        return cv2.fastNlMeansDenoisingColored(img, None, 10, 10, 7, 21)
+    return cv2.bilateralFilter(img, 7, 35, 35)
+
+
+# 3x3 sharpening kernel for face_enhance
+_SHARPEN_KERNEL = np.array([[-1, -1, -1],
+                            [-1,  9, -1],
+                            [-1, -1, -1]], dtype=np.float32)
+
+# CLAHE objects keep working buffers, so one per worker thread
+_clahe_local = threading.local()
+
 
+def _clahe() -> "cv2.CLAHE":
+    """This thread's CLAHE (clip limit 2, 8x8 tiles), created on first use"""
+    clahe = getattr(_clahe_local, "clahe", None)
+    if clahe is None:
+        clahe = _clahe_local.clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
+    return clahe
 
-async def face_enhance(source_path: str) -> str:
+
+def face_enhance(img: np.ndarray, quality: str = "fast") -> np.ndarray:
     """
     Face enhancement
-    Sharpening, noise reduction, color correction
+    Sharpening, noise reduction, color correction (may work in place on ``img``)
     """
-    img = cv2.imread(source_path)
-    if img is None:
-        raise HTTPException(status_code=400, detail="Failed to load image")
-    
     # Detect face
-    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    faces = face_cascade.detectMultiScale(gray, 1.1, 5)
+    faces = detect_faces(img)
     
-    result = img.copy()
+    result = img
     
     if len(faces) > 0:
+        clahe = _clahe()
         for (x, y, w, h) in faces:
-            # Extract face
-            face = result[y:y+h, x:x+w]
+            # Face region (a view; the final conversion writes into it)
+            roi = result[y:y+h, x:x+w]
             
-            # Denoise
-            face = cv2.fastNlMeansDenoisingColored(face, None, 10, 10, 7, 21)
+            # Denoise into a fresh buffer, then work on it in place
+            face = _denoise(roi, quality)
             
             # Enhance details
-            kernel = np.array([[-1,-1,-1],
-                               [-1, 9,-1],
-                               [-1,-1,-1]])
-            face = cv2.filter2D(face, -1, kernel)
+            cv2.filter2D(face, -1, _SHARPEN_KERNEL, dst=face)
             
-            # Color correction
-            lab = cv2.cvtColor(face, cv2.COLOR_BGR2LAB)
-            l, a, b = cv2.split(lab)
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-            l = clahe.apply(l)
-            face = cv2.merge([l, a, b])
-            face = cv2.cvtColor(face, cv2.COLOR_LAB2BGR)
-            
-            result[y:y+h, x:x+w] = face
+            # Color correction: CLAHE on the L channel only
+            lab = cv2.cvtColor(face, cv2.COLOR_BGR2LAB, dst=face)
+            l = cv2.extractChannel(lab, 0)
+            clahe.apply(l, dst=l)
+            cv2.insertChannel(l, lab, 0)
+            cv2.cvtColor(lab, cv2.COLOR_LAB2BGR, dst=roi)
     else:
         # Enhance entire image if no face detected
-        result = cv2.fastNlMeansDenoisingColored(result, None, 10, 10, 7, 21)
-    
-    # Save
-    session_id = os.path.basename(source_path).split('_')[1].split('.')[0]
-    output_path = OUTPUT_DIR / f"result_{session_id}.jpg"
-    cv2.imwrite(str(output_path), result)
+        result = _denoise(result, quality)
     
-    return str(output_path)
+    return result
 
 
-async def lip_sync(source_path: str, audio_path: str) -> str:
+def lip_sync(img: np.ndarray, audio: bytes) -> np.ndarray:
     """
     Lip sync (placeholder - requires video processing)
     For now, returns enhanced source image
     """
-    if not audio_path:
-        raise HTTPException(status_code=400, detail="Audio file required for lip sync")
-    
-    img = cv2.imread(source_path)
-    if img is None:
-        raise HTTPException(status_code=400, detail="Failed to load image")
-    
-    # Save (currently just returns source)
-    session_id = os.path.basename(source_path).split('_')[1].split('.')[0]
-    output_path = OUTPUT_DIR / f"result_{session_id}.jpg"
-    cv2.imwrite(str(output_path), img)
-    
-    return str(output_path)
+    # Currently just returns source
+    return img
 
 
-async def face_animate(source_path: str) -> str:
+def face_animate(img: np.ndarray) -> np.ndarray:
     """
     Face animation (placeholder - requires video generation)
     For now, creates a simple motion effect
     """
-    img = cv2.imread(source_path)
-    if img is None:
-        raise HTTPException(status_code=400, detail="Failed to load image")
-    
-    # Create subtle motion blur effect
-    kernel_size = 15
-    kernel = np.zeros((kernel_size, kernel_size))
-    kernel[int((kernel_size-1)/2), :] = np.ones(kernel_size)
-    kernel /= kernel_size
-    result = cv2.filter2D(img, -1, kernel)
-    
-    # Save
-    session_id = os.path.basename(source_path).split('_')[1].split('.')[0]
-    output_path = OUTPUT_DIR / f"result_{session_id}.jpg"
-    cv2.imwrite(str(output_path), result)
+    # Create subtle motion blur effect (15-pixel horizontal average)
+    result = cv2.boxFilter(img, -1, (15, 1))
     
-    return str(output_path)
+    return result
@@ -3,14 +3,18 @@ Deepfake Detection API Endpoints
 All deepfake analysis routes
 """
 
+import asyncio
 from fastapi import APIRouter, UploadFile, File, HTTPException, BackgroundTasks, Depends
-from fastapi.responses import JSONResponse
-import aiofiles
+from fastapi.responses import JSONResponse, Response
+import orjson
 import os
+import re
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Callable, Dict, Optional, List, Tuple
 import logging
+import time
 from datetime import datetime
+from types import MappingProxyType
 import uuid
 
 from app.services.deepfake_detectors import (
@@ -19,6 +23,9 @@ from app.services.deepfake_detectors import (
     DetectionMethod
 )
 from app.core.dependencies import get_current_user, get_db
+from app.models.database import Incident, IncidentSeverity
+from app.utils.helpers import StorageHelper
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
@@ -29,6 +36,19 @@ router = APIRouter()
 UPLOAD_DIR = Path("/tmp/deepfake_uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+# Upload extensions kept on saved files; anything else is dropped
+_SAFE_SUFFIX = re.compile(r"\.[A-Za-z0-9]{1,10}")
+
+
+def _upload_suffix(filename: Optional[str]) -> str:
+    """Extension of an uploaded filename, or "" when missing or unsafe"""
+    suffix = os.path.splitext(filename or "")[1]
+    return suffix if _SAFE_SUFFIX.fullmatch(suffix) else ""
+
+
+# Files of one /batch/analyze request analyzed at the same time
+BATCH_CONCURRENCY = int(os.getenv("DEEPFAKE_BATCH_CONCURRENCY", str(min(8, os.cpu_count() or 4))))
+
 
 # ============================================================================
 # DEEPFAKE VIDEO ANALYSIS
@@ -52,21 +72,17 @@ async def analyze_deepfake_video(
     - Full body manipulation
     """
     try:
-        session_id = str(uuid.uuid4())
+        session_id = uuid.uuid4().hex
         
         # Save video file
         video_path = UPLOAD_DIR / f"video_{session_id}.mp4"
-        async with aiofiles.open(video_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        await StorageHelper.stream_upload(file, video_path)
         
         # Save audio file if provided
         audio_path = None
         if audio_file:
             audio_path = UPLOAD_DIR / f"audio_{session_id}.wav"
-            async with aiofiles.open(audio_path, 'wb') as f:
-                content = await audio_file.read()
-                await f.write(content)
+            await StorageHelper.stream_upload(audio_file, audio_path)
         
         # Analyze
         analyzer = get_deepfake_analyzer()
@@ -131,13 +147,11 @@ async def analyze_deepfake_audio(
     - Audio artifact patterns
     """
     try:
-        session_id = str(uuid.uuid4())
+        session_id = uuid.uuid4().hex
         
         # Save audio file
         audio_path = UPLOAD_DIR / f"audio_{session_id}.wav"
-        async with aiofiles.open(audio_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        await StorageHelper.stream_upload(file, audio_path)
         
         # Analyze
         analyzer = get_deepfake_analyzer()
@@ -190,13 +204,11 @@ async def analyze_document_forgery(
     - Text manipulation
     """
     try:
-        session_id = str(uuid.uuid4())
+        session_id = uuid.uuid4().hex
         
         # Save image file
         image_path = UPLOAD_DIR / f"document_{session_id}.png"
-        async with aiofiles.open(image_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        await StorageHelper.stream_upload(file, image_path)
         
         # Analyze
         analyzer = get_deepfake_analyzer()
@@ -249,12 +261,16 @@ async def analyze_batch_deepfakes(
     - auto: Auto-detect file type
     """
     try:
-        session_id = str(uuid.uuid4())
-        results = []
-        
+        session_id = uuid.uuid4().hex
         analyzer = get_deepfake_analyzer()
+        analyzers = {
+            "video": analyzer.analyze_video,
+            "audio": analyzer.analyze_audio,
+            "document": analyzer.analyze_document,
+        }
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
         
-        for idx, file in enumerate(files):
+        async def analyze_one(idx: int, file: UploadFile):
             try:
                 file_type = analysis_type
                 
@@ -267,48 +283,49 @@ async def analyze_batch_deepfakes(
                     elif file.content_type.startswith("image"):
                         file_type = "document"
                 
-                # Save file
-                ext = Path(file.filename).suffix
-                file_path = UPLOAD_DIR / f"{file_type}_{session_id}_{idx}{ext}"
-                async with aiofiles.open(file_path, 'wb') as f:
-                    content = await file.read()
-                    await f.write(content)
+                analyze = analyzers.get(file_type)
+                if analyze is None:
+                    return None
                 
-                # Analyze based on type
-                if file_type == "video":
-                    result = analyzer.analyze_video(str(file_path))
-                elif file_type == "audio":
-                    result = analyzer.analyze_audio(str(file_path))
-                elif file_type == "document":
-                    result = analyzer.analyze_document(str(file_path))
-                else:
-                    result = None
+                async with semaphore:
+                    # Save file
+                    ext = _upload_suffix(file.filename)
+                    file_path = UPLOAD_DIR / f"{file_type}_{session_id}_{idx}{ext}"
+                    await StorageHelper.stream_upload(file, file_path)
+                    
+                    # Analyze based on type
+                    result = await asyncio.to_thread(analyze, str(file_path))
                 
-                if result:
-                    results.append({
-                        "file_index": idx,
-                        "filename": file.filename,
-                        "file_type": file_type,
-                        "is_deepfake": result.is_deepfake,
-                        "fraud_score": result.fraud_score,
-                        "confidence": result.confidence,
-                        "detected_types": [
-                            {
-                                "type": ind.type.value,
-                                "severity": ind.severity,
-                                "score": ind.score
-                            }
-                            for ind in result.detected_types
-                        ]
-                    })
+                return {
+                    "file_index": idx,
+                    "filename": file.filename,
+                    "file_type": file_type,
+                    "is_deepfake": result.is_deepfake,
+                    "fraud_score": result.fraud_score,
+                    "confidence": result.confidence,
+                    "detected_types": [
+                        {
+                            "type": ind.type.value,
+                            "severity": ind.severity,
+                            "score": ind.score
+                        }
+                        for ind in result.detected_types
+                    ]
+                }
             
             except Exception as e:
                 logger.error(f"Error analyzing file {file.filename}: {str(e)}")
-                results.append({
+                return {
                     "file_index": idx,
                     "filename": file.filename,
                     "error": str(e)
-                })
+                }
+        
+        # Files are independent: save and analyze them concurrently, in order
+        outcomes = await asyncio.gather(
+            *(analyze_one(idx, file) for idx, file in enumerate(files))
+        )
+        results = [outcome for outcome in outcomes if outcome]
         
         return {
             "session_id": session_id,
@@ -328,15 +345,28 @@ async def analyze_batch_deepfakes(
 # DEEPFAKE DETECTION STATISTICS
 # ============================================================================
 
-@router.get("/statistics/deepfake-types", tags=["Statistics"])
-async def get_deepfake_type_stats(
-    days: int = 30,
-    current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Get statistics on deepfake types detected
-    """
+# Serialized statistics bodies are reused for STATS_CACHE_TTL seconds
+STATS_CACHE_TTL = 60.0
+STATS_CACHE_SIZE = 256
+_stats_cache: Dict[Tuple[str, int], Tuple[float, bytes]] = {}
+
+
+def _cached_stats(name: str, days: int, build: Callable[[int], Dict[str, Any]]) -> Response:
+    """JSON response for a statistics payload, serializing it once per TTL"""
+    key = (name, days)
+    cached = _stats_cache.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        body = cached[1]
+    else:
+        body = orjson.dumps(build(days))
+        if len(_stats_cache) >= STATS_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            _stats_cache.pop(next(iter(_stats_cache)), None)
+        _stats_cache[key] = (time.monotonic() + STATS_CACHE_TTL, body)
+    return Response(content=body, media_type="application/json")
+
+
+def _deepfake_type_stats(days: int) -> Dict[str, Any]:
     # In production, query database for historical data
     return {
         "period_days": days,
@@ -376,14 +406,7 @@ async def get_deepfake_type_stats(
     }
 
 
-@router.get("/statistics/detection-methods", tags=["Statistics"])
-async def get_detection_method_stats(
-    current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Get effectiveness statistics for detection methods
-    """
+def _detection_method_stats(days: int) -> Dict[str, Any]:
     return {
         "detection_methods": [
             {
@@ -420,10 +443,61 @@ async def get_detection_method_stats(
     }
 
 
+@router.get("/statistics/deepfake-types", tags=["Statistics"])
+async def get_deepfake_type_stats(
+    days: int = 30,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get statistics on deepfake types detected
+    """
+    return _cached_stats("deepfake-types", days, _deepfake_type_stats)
+
+
+@router.get("/statistics/detection-methods", tags=["Statistics"])
+async def get_detection_method_stats(
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get effectiveness statistics for detection methods
+    """
+    return _cached_stats("detection-methods", 0, _detection_method_stats)
+
+
 # ============================================================================
 # DEEPFAKE DETECTION ALERTS
 # ============================================================================
 
+# Unresolved incidents of one user: per-severity counts in one grouped
+# query, plus the latest few
+_ACTIVE_INCIDENT = (Incident.user_id == bindparam("user_id")) & Incident.resolved_at.is_(None)
+_ALERT_COUNTS = select(Incident.severity, func.count()).where(_ACTIVE_INCIDENT).group_by(Incident.severity)
+_RECENT_ALERTS = select(Incident).where(_ACTIVE_INCIDENT).order_by(Incident.created_at.desc())
+RECENT_ALERTS_LIMIT = 10
+
+# Alert severity labels, most severe first
+SEVERITY_LABELS = MappingProxyType({
+    level: level.value.upper() for level in reversed(IncidentSeverity)
+})
+
+
+def _load_active_alerts(
+    db: Session,
+    user_id: str,
+    severity: Optional[IncidentSeverity]
+) -> Tuple[List[Tuple[IncidentSeverity, int]], List[Incident]]:
+    """Severity counts and most recent unresolved incidents (optionally of one severity)"""
+    params = {"user_id": user_id}
+    counts = db.execute(_ALERT_COUNTS, params).all()
+    recent_query = _RECENT_ALERTS
+    if severity is not None:
+        recent_query = recent_query.where(Incident.severity == severity)
+    recent = db.execute(recent_query.limit(RECENT_ALERTS_LIMIT), params).scalars().all()
+    return counts, recent
+
+
 @router.get("/alerts/active", tags=["Alerts"])
 async def get_active_deepfake_alerts(
     severity: Optional[str] = None,
@@ -435,34 +509,34 @@ async def get_active_deepfake_alerts(
     
     Severity levels: LOW, MEDIUM, HIGH, CRITICAL
     """
-    # In production, query database for active incidents
+    severity_filter = None
+    if severity:
+        try:
+            severity_filter = IncidentSeverity(severity.lower())
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Unknown severity: {severity}")
+    
+    counts, recent = await asyncio.to_thread(_load_active_alerts, db, current_user.id, severity_filter)
+    
+    by_severity = dict.fromkeys(SEVERITY_LABELS.values(), 0)
+    for level, count in counts:
+        if level is not None:
+            by_severity[SEVERITY_LABELS[level]] = count
+    
     return {
-        "total_alerts": 45,
-        "by_severity": {
-            "CRITICAL": 5,
-            "HIGH": 12,
-            "MEDIUM": 18,
-            "LOW": 10
-        },
+        "total_alerts": sum(by_severity.values()),
+        "by_severity": by_severity,
         "recent_alerts": [
             {
-                "alert_id": "ALT-001",
-                "type": "face_swap",
-                "severity": "CRITICAL",
-                "confidence": 0.94,
-                "detected_at": "2025-12-03T14:32:15Z",
-                "source": "video_upload_12345",
-                "status": "escalated"
-            },
-            {
-                "alert_id": "ALT-002",
-                "type": "voice_synthesis",
-                "severity": "HIGH",
-                "confidence": 0.87,
-                "detected_at": "2025-12-03T14:28:42Z",
-                "source": "audio_upload_67890",
-                "status": "under_review"
-            },
+                "alert_id": incident.id,
+                "type": incident.title,
+                "severity": SEVERITY_LABELS.get(incident.severity),
+                "confidence": incident.risk_score,
+                "detected_at": incident.created_at.isoformat() + "Z" if incident.created_at else None,
+                "source": incident.session_id,
+                "status": "reviewed" if incident.is_reviewed else "pending_review"
+            }
+            for incident in recent
         ]
     }
 
@@ -488,14 +562,12 @@ async def analyze_deepfake_patterns(
     - Risk assessment
     """
     try:
-        session_id = str(uuid.uuid4())
+        session_id = uuid.uuid4().hex
         
         # Save file
-        file_ext = Path(file.filename).suffix
+        file_ext = _upload_suffix(file.filename)
         file_path = UPLOAD_DIR / f"pattern_{session_id}{file_ext}"
-        async with aiofiles.open(file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        await StorageHelper.stream_upload(file, file_path)
         
         # In production, perform detailed pattern analysis
         return {
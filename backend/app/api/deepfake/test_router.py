@@ -0,0 +1,157 @@
+"""Tests for the /alerts/active deepfake alert summary"""
+
+import importlib
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.dependencies import get_current_user, get_db
+from app.models.database import Incident, IncidentSeverity
+
+# The package re-exports the APIRouter as ``router``, shadowing the module
+deepfake_router = importlib.import_module("app.api.deepfake.router")
+
+USER_ID = "user-1"
+OTHER_USER_ID = "user-2"
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_sqlite_json(element, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture
+def session_factory():
+    """In-memory incidents table standing in for the app database"""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Incident.__table__.create(engine)
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+@pytest.fixture
+def client(session_factory):
+    app = FastAPI()
+    app.include_router(deepfake_router.router)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=USER_ID)
+    return TestClient(app)
+
+
+def _incident(minutes_ago: int, severity, user_id: str = USER_ID, resolved: bool = False, **fields):
+    return Incident(
+        id=f"{user_id}-{minutes_ago}",
+        user_id=user_id,
+        session_id=f"session-{minutes_ago}",
+        title=f"Deepfake {minutes_ago}",
+        risk_score=0.9,
+        severity=severity,
+        created_at=NOW - timedelta(minutes=minutes_ago),
+        resolved_at=NOW if resolved else None,
+        **fields,
+    )
+
+
+def _store(session_factory, *incidents):
+    with session_factory() as db:
+        db.add_all(incidents)
+        db.commit()
+
+
+def test_counts_every_severity_of_the_users_unresolved_incidents(client, session_factory):
+    _store(
+        session_factory,
+        _incident(1, IncidentSeverity.CRITICAL),
+        _incident(2, IncidentSeverity.HIGH),
+        _incident(3, IncidentSeverity.HIGH),
+        _incident(4, IncidentSeverity.LOW, resolved=True),
+        _incident(5, IncidentSeverity.MEDIUM, user_id=OTHER_USER_ID),
+    )
+
+    body = client.get("/alerts/active").json()
+
+    assert body["total_alerts"] == 3
+    assert body["by_severity"] == {"CRITICAL": 1, "HIGH": 2, "MEDIUM": 0, "LOW": 0}
+    assert list(body["by_severity"]) == ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
+
+
+def test_recent_alerts_are_newest_first_and_limited(client, session_factory, monkeypatch):
+    monkeypatch.setattr(deepfake_router, "RECENT_ALERTS_LIMIT", 2)
+    _store(
+        session_factory,
+        _incident(30, IncidentSeverity.LOW),
+        _incident(10, IncidentSeverity.HIGH, is_reviewed=True),
+        _incident(20, IncidentSeverity.MEDIUM),
+    )
+
+    recent = client.get("/alerts/active").json()["recent_alerts"]
+
+    assert recent == [
+        {
+            "alert_id": f"{USER_ID}-10",
+            "type": "Deepfake 10",
+            "severity": "HIGH",
+            "confidence": 0.9,
+            "detected_at": "2024-06-01T11:50:00Z",
+            "source": "session-10",
+            "status": "reviewed",
+        },
+        {
+            "alert_id": f"{USER_ID}-20",
+            "type": "Deepfake 20",
+            "severity": "MEDIUM",
+            "confidence": 0.9,
+            "detected_at": "2024-06-01T11:40:00Z",
+            "source": "session-20",
+            "status": "pending_review",
+        },
+    ]
+
+
+def test_severity_filter_narrows_recent_alerts_but_not_the_counts(client, session_factory):
+    _store(
+        session_factory,
+        _incident(1, IncidentSeverity.CRITICAL),
+        _incident(2, IncidentSeverity.HIGH),
+    )
+
+    body = client.get("/alerts/active", params={"severity": "high"}).json()
+
+    assert [alert["severity"] for alert in body["recent_alerts"]] == ["HIGH"]
+    assert body["by_severity"]["CRITICAL"] == 1
+    assert body["total_alerts"] == 2
+
+
+def test_unknown_severity_is_rejected(client):
+    response = client.get("/alerts/active", params={"severity": "urgent"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown severity: urgent"
+
+
+def test_no_incidents(client):
+    body = client.get("/alerts/active").json()
+
+    assert body == {
+        "total_alerts": 0,
+        "by_severity": {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0},
+        "recent_alerts": [],
+    }
@@ -4,11 +4,22 @@ Government-grade deepfake detection with automated legal document generation
 """
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi.responses import FileResponse, ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
+from pathlib import Path
+from string import Template
+from types import MappingProxyType
+import asyncio
+import io
 import uuid
 import logging
+import os
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Preformatted, SimpleDocTemplate
 
 from app.core.dependencies import get_current_user, get_db
 from app.models.database import User
@@ -16,7 +27,62 @@ from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Rendered legal documents: LEGAL_DOCS_DIR/<document id hex>/<filename>,
+# next to an OWNER_FILE holding the id of the user who generated them
+LEGAL_DOCS_DIR = Path(os.getenv("LEGAL_DOCS_DIR", "legal_documents"))
+DOWNLOADABLE_DOCUMENTS = frozenset({"dmca.pdf", "fir.pdf", "affidavit.pdf"})
+OWNER_FILE = "owner"
+
+
+# Characters per line before the Courier text of a PDF wraps on A4
+PDF_LINE_LENGTH = 90
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    """Write ``content`` to ``path`` so readers see all of it or nothing"""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+
+
+def store_legal_document(doc_id: str, filename: str, content: bytes, owner_id: str) -> Path:
+    """
+    Save a rendered document where download_legal_document serves it from
+    
+    The owner file is in place before the document appears, so a download
+    never finds a document without its owner.
+    """
+    doc_dir = LEGAL_DOCS_DIR / uuid.UUID(doc_id).hex
+    doc_dir.mkdir(parents=True, exist_ok=True)
+    _write_atomic(doc_dir / OWNER_FILE, str(owner_id).encode())
+    path = doc_dir / filename
+    _write_atomic(path, content)
+    return path
+
+
+def render_pdf(title: str, text: str) -> bytes:
+    """Typeset a plain-text legal document as a PDF, keeping its layout"""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, title=title)
+    body = Preformatted(text.strip("\n"), getSampleStyleSheet()["Code"], maxLineLength=PDF_LINE_LENGTH)
+    doc.build([body])
+    return buffer.getvalue()
+
+
+async def _publish_document(doc_id: str, filename: str, title: str, text: str, owner_id: str) -> None:
+    """Render ``text`` and store it for its owner, off the event loop"""
+    def publish():
+        store_legal_document(doc_id, filename, render_pdf(title, text), owner_id)
+    await asyncio.to_thread(publish)
+
+
+def _document_owner(doc_dir: Path) -> Optional[str]:
+    try:
+        return (doc_dir / OWNER_FILE).read_text().strip()
+    except OSError:
+        return None
 
 
 # ============================================================================
@@ -59,41 +125,25 @@ class EvidencePackage(BaseModel):
 # DMCA TAKEDOWN GENERATOR
 # ============================================================================
 
-@router.post("/takedown/dmca/generate")
-async def generate_dmca_notice(
-    request: TakedownRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Generate DMCA-style takedown notice
-    """
-    try:
-        notice_id = str(uuid.uuid4())
-        
-        dmca_notice = {
-            "notice_id": notice_id,
-            "notice_type": "DMCA Takedown Notice",
-            "date": datetime.utcnow().isoformat(),
-            "content": f"""
+DMCA_TEMPLATE = Template("""
 DMCA TAKEDOWN NOTICE
 
 To: Platform Designated Agent
-Date: {datetime.utcnow().strftime('%B %d, %Y')}
-Notice ID: {notice_id}
+Date: $date
+Notice ID: $notice_id
 
-I, {request.victim_name}, certify under penalty of perjury that I am the copyright owner 
+I, $victim_name, certify under penalty of perjury that I am the copyright owner 
 or authorized to act on behalf of the copyright owner of content that is being infringed.
 
 IDENTIFICATION OF COPYRIGHTED WORK:
-Original content available at: {request.original_content_url or 'Provided as attachment'}
+Original content available at: $original_content_url
 
 IDENTIFICATION OF INFRINGING MATERIAL:
 The following URLs contain unauthorized deepfake/manipulated versions of my copyrighted content:
-{chr(10).join('- ' + url for url in request.content_urls)}
+$urls
 
 DESCRIPTION OF INFRINGEMENT:
-{request.description}
+$description
 
 The above materials are deepfake manipulations created without my consent, violating:
 - My copyright in the original work
@@ -102,9 +152,9 @@ The above materials are deepfake manipulations created without my consent, viola
 - Applicable laws against non-consensual intimate imagery
 
 CONTACT INFORMATION:
-Name: {request.victim_name}
-Email: {request.victim_email}
-Phone: {request.victim_phone or 'N/A'}
+Name: $victim_name
+Email: $victim_email
+Phone: $victim_phone
 
 GOOD FAITH STATEMENT:
 I have a good faith belief that the use of the material in the manner complained of is not 
@@ -121,15 +171,48 @@ I request that you immediately:
 3. Prevent future uploads of this content
 4. Provide confirmation of removal
 
-Electronic Signature: {request.victim_name}
-Date: {datetime.utcnow().strftime('%B %d, %Y')}
+Electronic Signature: $victim_name
+Date: $date
+
+Case Reference: $incident_id
+            """)
 
-Case Reference: {request.incident_id}
-            """,
+
+@router.post("/takedown/dmca/generate")
+async def generate_dmca_notice(
+    request: TakedownRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Generate DMCA-style takedown notice
+    """
+    try:
+        notice_id = uuid.uuid4().hex
+        now = datetime.utcnow()
+        
+        dmca_notice = {
+            "notice_id": notice_id,
+            "notice_type": "DMCA Takedown Notice",
+            "date": now.isoformat(),
+            "content": DMCA_TEMPLATE.substitute(
+                date=now.strftime('%B %d, %Y'),
+                notice_id=notice_id,
+                victim_name=request.victim_name,
+                original_content_url=request.original_content_url or 'Provided as attachment',
+                urls="\n".join(["- " + url for url in request.content_urls]),
+                description=request.description,
+                victim_email=request.victim_email,
+                victim_phone=request.victim_phone or 'N/A',
+                incident_id=request.incident_id
+            ),
             "platforms": request.platforms,
             "status": "generated",
             "created_by": current_user.id
         }
+        await _publish_document(
+            notice_id, "dmca.pdf", dmca_notice["notice_type"], dmca_notice["content"], current_user.id
+        )
         
         return {
             "success": True,
@@ -147,62 +230,41 @@ Case Reference: {request.incident_id}
 # INDIAN IT ACT FIR GENERATOR
 # ============================================================================
 
-@router.post("/legal/fir/generate")
-async def generate_fir_draft(
-    request: TakedownRequest,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Generate FIR draft under IT Act 2000 (Sections 66E, 67, 67A)
-    """
-    try:
-        fir_id = str(uuid.uuid4())
-        
-        sections_text = {
-            "66E": "Violation of privacy (Punishment for violation of privacy - Sec 66E)",
-            "67": "Publishing/transmitting obscene material (Sec 67)",
-            "67A": "Publishing/transmitting sexually explicit material (Sec 67A)",
-            "354C": "Voyeurism (IPC 354C)",
-            "509": "Insult to modesty (IPC 509)"
-        }
-        
-        applicable_sections = "\n".join(
-            f"- {sec}: {sections_text.get(sec, 'IT Act violation')}" 
-            for sec in request.it_act_sections
-        )
-        
-        fir_draft = {
-            "fir_id": fir_id,
-            "document_type": "First Information Report (FIR) - Draft",
-            "date": datetime.utcnow().isoformat(),
-            "content": f"""
+SECTIONS_TEXT = MappingProxyType({
+    "66E": "Violation of privacy (Punishment for violation of privacy - Sec 66E)",
+    "67": "Publishing/transmitting obscene material (Sec 67)",
+    "67A": "Publishing/transmitting sexually explicit material (Sec 67A)",
+    "354C": "Voyeurism (IPC 354C)",
+    "509": "Insult to modesty (IPC 509)"
+})
+
+FIR_TEMPLATE = Template("""
 FIRST INFORMATION REPORT (FIR) - DRAFT
 Cybercrime Police Station / Cyber Cell
 
 To: Station House Officer / Cyber Cell In-Charge
-Date: {datetime.utcnow().strftime('%d/%m/%Y')}
-FIR Reference: DEEPCLEAN-{fir_id[:8]}
+Date: $date
+FIR Reference: DEEPCLEAN-$fir_ref
 
 COMPLAINANT DETAILS:
-Name: {request.victim_name}
-Contact: {request.victim_email}
-Phone: {request.victim_phone or 'N/A'}
+Name: $victim_name
+Contact: $victim_email
+Phone: $victim_phone
 
 NATURE OF COMPLAINT:
 Deepfake Creation and Distribution / Non-Consensual Intimate Image Distribution / 
 Violation of Privacy under Information Technology Act, 2000
 
 APPLICABLE SECTIONS:
-{applicable_sections}
+$applicable_sections
 
 DETAILED COMPLAINT:
-{request.description}
+$description
 
 DIGITAL EVIDENCE:
 1. Original content (authenticated)
 2. Manipulated deepfake content found at:
-{chr(10).join('   - ' + url for url in request.content_urls)}
+$urls
 3. Forensic analysis report (attached)
 4. Digital fingerprint evidence (attached)
 
@@ -228,11 +290,11 @@ I request your good office to:
 6. Take necessary legal action
 
 VERIFICATION:
-I, {request.victim_name}, hereby declare that the contents of this complaint are true 
+I, $victim_name, hereby declare that the contents of this complaint are true 
 and correct to the best of my knowledge and belief.
 
 Complainant Signature: _________________
-Date: {datetime.utcnow().strftime('%d/%m/%Y')}
+Date: $date
 Place: 
 
 Supporting Documents:
@@ -241,12 +303,50 @@ Supporting Documents:
 - Platform URLs List
 - Identity Verification Documents
 
-Case ID: {request.incident_id}
+Case ID: $incident_id
 Generated by: DeepClean AI - National Deepfake Detection System
-            """,
+            """)
+
+
+@router.post("/legal/fir/generate")
+async def generate_fir_draft(
+    request: TakedownRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Generate FIR draft under IT Act 2000 (Sections 66E, 67, 67A)
+    """
+    try:
+        fir_id = uuid.uuid4().hex
+        now = datetime.utcnow()
+        
+        applicable_sections = "\n".join([
+            f"- {sec}: {SECTIONS_TEXT.get(sec, 'IT Act violation')}"
+            for sec in request.it_act_sections
+        ])
+        
+        fir_draft = {
+            "fir_id": fir_id,
+            "document_type": "First Information Report (FIR) - Draft",
+            "date": now.isoformat(),
+            "content": FIR_TEMPLATE.substitute(
+                date=now.strftime('%d/%m/%Y'),
+                fir_ref=fir_id[:8],
+                victim_name=request.victim_name,
+                victim_email=request.victim_email,
+                victim_phone=request.victim_phone or 'N/A',
+                applicable_sections=applicable_sections,
+                description=request.description,
+                urls="\n".join(["   - " + url for url in request.content_urls]),
+                incident_id=request.incident_id
+            ),
             "status": "draft",
             "created_by": current_user.id
         }
+        await _publish_document(
+            fir_id, "fir.pdf", fir_draft["document_type"], fir_draft["content"], current_user.id
+        )
         
         return {
             "success": True,
@@ -271,6 +371,26 @@ Generated by: DeepClean AI - National Deepfake Detection System
 # PLATFORM-SPECIFIC COMPLAINT GENERATORS
 # ============================================================================
 
+YOUTUBE_TEMPLATE = Template("""
+This video contains a deepfake manipulation of my likeness created without my consent.
+
+Issue Type: Privacy Violation / Deepfake / Non-Consensual Synthetic Media
+Original Content Owner: $victim_name
+
+Details: $description
+
+Evidence: Forensic analysis confirms AI-generated face swap/manipulation
+Case ID: $incident_id
+
+This violates YouTube's policies on:
+- Privacy violations
+- Deceptive practices and scams
+- Synthetic media policy
+
+Request: Immediate removal of all listed videos
+                """)
+
+
 @router.post("/takedown/youtube/generate")
 async def generate_youtube_complaint(
     request: TakedownRequest,
@@ -279,7 +399,7 @@ async def generate_youtube_complaint(
 ):
     """Generate YouTube-specific copyright/privacy complaint"""
     try:
-        complaint_id = str(uuid.uuid4())
+        complaint_id = uuid.uuid4().hex
         
         youtube_complaint = {
             "complaint_id": complaint_id,
@@ -289,24 +409,11 @@ async def generate_youtube_complaint(
                 "content_type": "Video",
                 "urls": request.content_urls,
                 "reason": "Privacy violation - Non-consensual deepfake",
-                "description": f"""
-This video contains a deepfake manipulation of my likeness created without my consent.
-
-Issue Type: Privacy Violation / Deepfake / Non-Consensual Synthetic Media
-Original Content Owner: {request.victim_name}
-
-Details: {request.description}
-
-Evidence: Forensic analysis confirms AI-generated face swap/manipulation
-Case ID: {request.incident_id}
-
-This violates YouTube's policies on:
-- Privacy violations
-- Deceptive practices and scams
-- Synthetic media policy
-
-Request: Immediate removal of all listed videos
-                """,
+                "description": YOUTUBE_TEMPLATE.substitute(
+                    victim_name=request.victim_name,
+                    description=request.description,
+                    incident_id=request.incident_id
+                ),
                 "contact_email": request.victim_email,
                 "legal_authority": "IT Act 2000 (India) Sections 66E, 67, 67A"
             },
@@ -331,6 +438,19 @@ Request: Immediate removal of all listed videos
         raise HTTPException(status_code=500, detail=str(e))
 
 
+INSTAGRAM_TEMPLATE = Template("""
+Non-consensual deepfake manipulation detected.
+Victim: $victim_name
+Description: $description
+Case ID: $incident_id
+
+This violates Instagram Community Guidelines on:
+- Bullying and harassment
+- Privacy violations
+- Impersonation
+                """)
+
+
 @router.post("/takedown/instagram/generate")
 async def generate_instagram_complaint(
     request: TakedownRequest,
@@ -339,7 +459,7 @@ async def generate_instagram_complaint(
 ):
     """Generate Instagram-specific report"""
     try:
-        complaint_id = str(uuid.uuid4())
+        complaint_id = uuid.uuid4().hex
         
         instagram_complaint = {
             "complaint_id": complaint_id,
@@ -348,21 +468,15 @@ async def generate_instagram_complaint(
             "form_data": {
                 "content_urls": request.content_urls,
                 "report_reason": "This content contains a deepfake of me",
-                "additional_info": f"""
-Non-consensual deepfake manipulation detected.
-Victim: {request.victim_name}
-Description: {request.description}
-Case ID: {request.incident_id}
-
-This violates Instagram Community Guidelines on:
-- Bullying and harassment
-- Privacy violations
-- Impersonation
-                """,
+                "additional_info": INSTAGRAM_TEMPLATE.substitute(
+                    victim_name=request.victim_name,
+                    description=request.description,
+                    incident_id=request.incident_id
+                ),
                 "contact": request.victim_email
             },
             "submission_method": "In-app reporting + Legal request form",
-            "legal_form_url": "https://help.instagram.com/contact/")
+            "legal_form_url": "https://help.instagram.com/contact/"
         }
         
         return {
@@ -375,6 +489,16 @@ This violates Instagram Community Guidelines on:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+TWITTER_TEMPLATE = Template("""
+Deepfake content - Non-consensual AI manipulation
+Affected person: $victim_name
+Details: $description
+Case ID: $incident_id
+
+Violates X's Synthetic and Manipulated Media Policy
+                """)
+
+
 @router.post("/takedown/twitter/generate")
 async def generate_twitter_complaint(
     request: TakedownRequest,
@@ -383,7 +507,7 @@ async def generate_twitter_complaint(
 ):
     """Generate Twitter/X-specific report"""
     try:
-        complaint_id = str(uuid.uuid4())
+        complaint_id = uuid.uuid4().hex
         
         twitter_complaint = {
             "complaint_id": complaint_id,
@@ -392,14 +516,11 @@ async def generate_twitter_complaint(
             "form_data": {
                 "tweet_urls": request.content_urls,
                 "violation_type": "Synthetic and manipulated media",
-                "description": f"""
-Deepfake content - Non-consensual AI manipulation
-Affected person: {request.victim_name}
-Details: {request.description}
-Case ID: {request.incident_id}
-
-Violates X's Synthetic and Manipulated Media Policy
-                """,
+                "description": TWITTER_TEMPLATE.substitute(
+                    victim_name=request.victim_name,
+                    description=request.description,
+                    incident_id=request.incident_id
+                ),
                 "contact": request.victim_email
             },
             "submission_url": "https://help.twitter.com/forms/synthetic-media"
@@ -419,27 +540,10 @@ Violates X's Synthetic and Manipulated Media Policy
 # AFFIDAVIT GENERATOR
 # ============================================================================
 
-@router.post("/legal/affidavit/generate")
-async def generate_affidavit(
-    request: LegalDocument,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Generate legal affidavit"""
-    try:
-        affidavit_id = str(uuid.uuid4())
-        
-        victim_name = request.victim_details.get('name', 'N/A')
-        victim_address = request.victim_details.get('address', 'N/A')
-        victim_age = request.victim_details.get('age', 'N/A')
-        
-        affidavit = {
-            "affidavit_id": affidavit_id,
-            "document_type": "Affidavit",
-            "content": f"""
+AFFIDAVIT_TEMPLATE = Template("""
 AFFIDAVIT
 
-I, {victim_name}, aged {victim_age} years, resident of {victim_address}, 
+I, $victim_name, aged $victim_age years, resident of $victim_address, 
 do hereby solemnly affirm and declare as under:
 
 1. That I am the complainant in the present case and am well acquainted with the 
@@ -455,7 +559,7 @@ do hereby solemnly affirm and declare as under:
    technology to falsely portray me in situations that never occurred.
 
 5. That forensic analysis conducted by DeepClean AI National Deepfake Detection 
-   System (Case ID: {request.incident_id}) has confirmed that the content is 
+   System (Case ID: $incident_id) has confirmed that the content is 
    artificially generated/manipulated.
 
 6. That the creation and distribution of such content has caused me severe mental 
@@ -481,15 +585,44 @@ are true and correct to the best of my knowledge and belief.
 DEPONENT
 
 Place: 
-Date: {datetime.utcnow().strftime('%d/%m/%Y')}
+Date: $date
 
 Solemnly affirmed before me:
 
 OATH COMMISSIONER / NOTARY PUBLIC
-            """,
+            """)
+
+
+@router.post("/legal/affidavit/generate")
+async def generate_affidavit(
+    request: LegalDocument,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Generate legal affidavit"""
+    try:
+        affidavit_id = uuid.uuid4().hex
+        
+        victim_name = request.victim_details.get('name', 'N/A')
+        victim_address = request.victim_details.get('address', 'N/A')
+        victim_age = request.victim_details.get('age', 'N/A')
+        
+        affidavit = {
+            "affidavit_id": affidavit_id,
+            "document_type": "Affidavit",
+            "content": AFFIDAVIT_TEMPLATE.substitute(
+                victim_name=victim_name,
+                victim_age=victim_age,
+                victim_address=victim_address,
+                incident_id=request.incident_id,
+                date=datetime.utcnow().strftime('%d/%m/%Y')
+            ),
             "status": "generated",
             "created_by": current_user.id
         }
+        await _publish_document(
+            affidavit_id, "affidavit.pdf", affidavit["document_type"], affidavit["content"], current_user.id
+        )
         
         return {
             "success": True,
@@ -520,13 +653,14 @@ async def generate_evidence_package(
 ):
     """Generate court-ready digital evidence package"""
     try:
-        package_id = str(uuid.uuid4())
+        package_id = uuid.uuid4().hex
+        generated_at = datetime.utcnow().isoformat()
         
         evidence_package = {
             "package_id": package_id,
             "incident_id": request.incident_id,
             "case_number": request.case_number,
-            "generated_at": datetime.utcnow().isoformat(),
+            "generated_at": generated_at,
             "package_type": "Digital Evidence Package - Court Ready",
             
             "contents": {
@@ -580,7 +714,7 @@ async def generate_evidence_package(
             
             "certification": {
                 "certified_by": "DeepClean AI System",
-                "certification_date": datetime.utcnow().isoformat(),
+                "certification_date": generated_at,
                 "integrity_hash": request.forensic_hash,
                 "standard_compliance": ["ISO 27037", "NIST Guidelines"],
                 "court_admissibility": "Meets Indian Evidence Act requirements"
@@ -590,7 +724,7 @@ async def generate_evidence_package(
                 {
                     "user": current_user.email,
                     "action": "Package generated",
-                    "timestamp": datetime.utcnow().isoformat()
+                    "timestamp": generated_at
                 }
             ]
         }
@@ -621,7 +755,7 @@ async def submit_bulk_takedown(
     Submit takedown to multiple platforms simultaneously
     """
     try:
-        bulk_id = str(uuid.uuid4())
+        bulk_id = uuid.uuid4().hex
         
         results = {}
         
@@ -720,7 +854,7 @@ async def generate_legal_consultation_package(
     """
     try:
         consultation_package = {
-            "package_id": str(uuid.uuid4()),
+            "package_id": uuid.uuid4().hex,
             "incident_id": incident_id,
             "generated_at": datetime.utcnow().isoformat(),
             
@@ -783,3 +917,36 @@ async def generate_legal_consultation_package(
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# ============================================================================
+# DOCUMENT DOWNLOAD
+# ============================================================================
+
+@router.get("/download/{doc_id}/{filename}")
+async def download_legal_document(
+    doc_id: str,
+    filename: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Download a rendered legal document (the ``download_url`` of a generator)
+    
+    Served with FileResponse, which the ASGI server streams with
+    sendfile(2) where available instead of reading it into Python. Only
+    the user who generated the document may download it; anyone else
+    gets 404, as for a missing document.
+    """
+    try:
+        doc_hex = uuid.UUID(doc_id).hex
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Document not found")
+    if filename not in DOWNLOADABLE_DOCUMENTS:
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    doc_dir = LEGAL_DOCS_DIR / doc_hex
+    path = doc_dir / filename
+    if _document_owner(doc_dir) != str(current_user.id) or not path.is_file():
+        raise HTTPException(status_code=404, detail="Document not found")
+    
+    return FileResponse(path, media_type="application/pdf", filename=filename)
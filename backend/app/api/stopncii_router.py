@@ -147,7 +147,7 @@ async def upload_and_analyze(
             file_size_bytes=file_size,
             media_type='video' if is_video else 'image',
             temp_file_path=temp_file.name,
-            metadata=metadata_dict,
+            job_metadata=metadata_dict,
             progress=0
         )
         db.add(job)
@@ -0,0 +1,110 @@
+"""Tests for the cached /auth/me profile and its invalidation"""
+
+from datetime import datetime
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import auth_router
+from app.core.dependencies import get_current_user, get_db, get_token_user_id
+from app.models.database import User, UserRole
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    """In-memory users table standing in for the app database"""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    User.__table__.create(engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    with factory() as db:
+        db.add(User(
+            id=USER_ID,
+            email="alice@example.com",
+            username="alice",
+            hashed_password="unused",
+            role=UserRole.CLIENT,
+            is_active=True,
+            is_verified=False,
+            created_at=datetime(2024, 1, 1),
+        ))
+        db.commit()
+
+    monkeypatch.setattr(auth_router, "SessionLocal", factory)
+    monkeypatch.setattr(auth_router, "_me_cache", {})
+    return factory
+
+
+@pytest.fixture
+def client(session_factory):
+    app = FastAPI()
+    app.include_router(auth_router.router)
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    def override_get_current_user(db: Session = Depends(get_db)):
+        return db.get(User, USER_ID)
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    app.dependency_overrides[get_token_user_id] = lambda: USER_ID
+    return TestClient(app)
+
+
+def _rename(session_factory, username: str):
+    """Change the profile behind the API's back, as another worker would"""
+    with session_factory() as db:
+        db.get(User, USER_ID).username = username
+        db.commit()
+
+
+def test_me_is_served_from_cache_within_ttl(client, session_factory):
+    first = client.get("/auth/me")
+    _rename(session_factory, "changed-elsewhere")
+    second = client.get("/auth/me")
+
+    assert first.status_code == second.status_code == 200
+    assert first.json()["username"] == "alice"
+    assert second.content == first.content
+    assert second.headers["content-type"] == "application/json"
+
+
+def test_me_reloads_once_the_entry_expires(client, session_factory, monkeypatch):
+    monkeypatch.setattr(auth_router, "ME_CACHE_TTL", 0.0)
+
+    client.get("/auth/me")
+    _rename(session_factory, "changed-elsewhere")
+
+    assert client.get("/auth/me").json()["username"] == "changed-elsewhere"
+
+
+def test_profile_update_evicts_the_cached_me(client):
+    assert client.get("/auth/me").json()["username"] == "alice"
+
+    updated = client.put("/auth/me", json={"username": "bob"})
+
+    assert updated.status_code == 200
+    assert updated.json()["username"] == "bob"
+    assert USER_ID not in auth_router._me_cache
+    assert client.get("/auth/me").json()["username"] == "bob"
+
+
+def test_unknown_user_is_rejected_and_not_cached(client):
+    client.app.dependency_overrides[get_token_user_id] = lambda: "missing-user"
+
+    response = client.get("/auth/me")
+
+    assert response.status_code == 401
+    assert "missing-user" not in auth_router._me_cache
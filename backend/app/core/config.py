@@ -116,6 +116,7 @@ class Settings(BaseSettings):
     # Video Deepfake Detector
     VIDEO_MODEL_PATH: str = os.path.join(MODELS_DIR, "video/deepfake_detector/model.onnx")
     VIDEO_RETINAFACE_PATH: str = os.path.join(MODELS_DIR, "video/retinaface/model.onnx")
+    FACE_DETECTOR_MODEL_PATH: str = os.path.join(MODELS_DIR, "face/yunet/face_detection_yunet_2023mar.onnx")
     VIDEO_FPS: int = 2  # Frames per second to extract
     VIDEO_MAX_FRAMES: int = 100
     VIDEO_DEEPFAKE_THRESHOLD: float = 0.65
@@ -4,6 +4,7 @@ Database sessions, authentication, rate limiting, pagination
 """
 
 from fastapi import Depends, HTTPException, status, Header, Query
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.models.database import SessionLocal, User
@@ -17,6 +18,11 @@ import time
 # Initialize JWT manager
 jwt_manager = JWTManager(settings.SECRET_KEY, settings.ALGORITHM)
 
+# Built once; the compiled SQL is reused from the engine's statement cache
+_USER_BY_API_KEY_HASH = select(User).where(
+    User.api_key_hash == bindparam("api_key_hash")
+).limit(1)
+
 
 # ============================================================================
 # Database Dependency
@@ -38,20 +44,12 @@ def get_db() -> Session:
 # Authentication Dependencies
 # ============================================================================
 
-def get_current_user(
-    authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
-) -> User:
+def get_token_user_id(authorization: Optional[str] = Header(None)) -> str:
     """
-    Get current authenticated user from JWT token
+    Verify the bearer access token and return its subject (user ID)
     
-    Args:
-        authorization: Bearer token from Authorization header
-        db: Database session
+    Does not touch the database; see get_current_user for the User row.
     
-    Returns:
-        User object if token is valid
-        
     Raises:
         HTTPException: 401 if token is missing or invalid
     """
@@ -102,8 +100,18 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    return user_id
+
+
+def load_active_user(db: Session, user_id: str) -> User:
+    """
+    Load the token's user, rejecting unknown or disabled accounts
+    
+    Raises:
+        HTTPException: 401 if the user does not exist, 403 if disabled
+    """
+    # Identity map first, then a PK lookup
+    user = db.get(User, user_id) if isinstance(user_id, str) else None
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -120,6 +128,26 @@ def get_current_user(
     return user
 
 
+def get_current_user(
+    authorization: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Get current authenticated user from JWT token
+    
+    Args:
+        authorization: Bearer token from Authorization header
+        db: Database session
+    
+    Returns:
+        User object if token is valid
+        
+    Raises:
+        HTTPException: 401 if token is missing or invalid
+    """
+    return load_active_user(db, get_token_user_id(authorization))
+
+
 def get_optional_user(
     authorization: Optional[str] = Header(None),
     db: Session = Depends(get_db)
@@ -198,7 +226,9 @@ def verify_api_key(
     api_key_hash = hashlib.sha256(x_api_key.encode()).hexdigest()
     
     # Find user with matching API key hash
-    user = db.query(User).filter(User.api_key_hash == api_key_hash).first()
+    user = db.execute(
+        _USER_BY_API_KEY_HASH, {"api_key_hash": api_key_hash}
+    ).scalar_one_or_none()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -2,7 +2,7 @@
 # JWT token management, password hashing, data encryption
 
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
@@ -13,15 +13,30 @@ import base64
 import secrets
 import os
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# New hashes use Argon2id; existing bcrypt hashes still verify and are
+# flagged for rehash, so they migrate on the user's next login. Costs can be
+# tuned per deployment (login throughput is bounded by hash time).
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__time_cost=int(os.getenv("ARGON2_TIME_COST", "2")),
+    argon2__memory_cost=int(os.getenv("ARGON2_MEMORY_COST", "65536")),  # KiB
+    bcrypt__rounds=int(os.getenv("BCRYPT_ROUNDS", "12")),
+)
 
 
 class JWTManager:
     """JWT token operations for authentication"""
     
+    ACCESS_TOKEN_TTL = timedelta(hours=24)
+    REFRESH_TOKEN_TTL = timedelta(days=30)
+    
     def __init__(self, secret_key: str, algorithm: str = "HS256"):
         self.secret_key = secret_key
         self.algorithm = algorithm
+        # Claims that are the same for every token of a kind
+        self._access_claims = {"iss": "deepclean-api", "type": "access"}
+        self._refresh_claims = {"type": "refresh"}
     
     def create_access_token(
         self,
@@ -30,18 +45,13 @@ class JWTManager:
         expires_delta: Optional[timedelta] = None
     ) -> str:
         """Generate access token with user claims"""
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(hours=24)
-        
+        now = datetime.utcnow()
         payload = {
             "sub": user_id,
             "role": role,
-            "exp": expire,
-            "iat": datetime.utcnow(),
-            "iss": "deepclean-api",
-            "type": "access"
+            "exp": now + (expires_delta or self.ACCESS_TOKEN_TTL),
+            "iat": now,
+            **self._access_claims
         }
         
         return jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
@@ -52,20 +62,15 @@ class JWTManager:
         expires_delta: Optional[timedelta] = None
     ) -> str:
         """Create JWT refresh token"""
-        if expires_delta:
-            expire = datetime.utcnow() + expires_delta
-        else:
-            expire = datetime.utcnow() + timedelta(days=30)
-        
+        now = datetime.utcnow()
         to_encode = {
             "sub": user_id,
-            "exp": expire,
-            "iat": datetime.utcnow(),
-            "type": "refresh"
+            "exp": now + (expires_delta or self.REFRESH_TOKEN_TTL),
+            "iat": now,
+            **self._refresh_claims
         }
         
-        encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
-        return encoded_jwt
+        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
     
     def verify_token(self, token: str) -> Dict[str, Any]:
         """Verify and decode JWT"""
@@ -130,13 +135,18 @@ class PasswordManager:
     
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hash password using bcrypt"""
+        """Hash password using Argon2id"""
         return pwd_context.hash(password)
     
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify password against hash"""
         return pwd_context.verify(plain_password, hashed_password)
+    
+    @staticmethod
+    def verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify password, also returning a replacement hash if the stored one is outdated"""
+        return pwd_context.verify_and_update(plain_password, hashed_password)
 
 
 class APIKeyManager:
@@ -8,13 +8,22 @@ Production-ready models for:
 - Content reports and takedown requests
 - Hash matching records
 - Audit logging
+
+JSONB columns carry GIN indexes built with ``jsonb_path_ops``. Those only
+serve containment lookups, so filter with ``@>`` (``Column.contains({...})``)
+rather than ``->>`` equality when querying them.
 """
 
-from sqlalchemy import Column, String, Float, DateTime, Boolean, Integer, JSON, ForeignKey, Text, Index, text
+from sqlalchemy import Column, String, Float, DateTime, Boolean, Integer, JSON, ForeignKey, Text, Index, text, event, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
+from sqlalchemy.schema import CreateIndex, DDL
 from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from itertools import islice
+import io
+import json
 import uuid
 
 Base = declarative_base()
@@ -70,7 +79,7 @@ class MediaHash(Base):
     __table_args__ = (
         Index('idx_hash_value_type', 'hash_value', 'hash_type'),
         Index('idx_status_deepfake', 'status', 'is_deepfake'),
-        Index('idx_created_at_desc', 'created_at', postgresql_ops={'created_at': 'DESC'}),
+        Index('idx_media_hashes_created_desc', 'created_at', postgresql_ops={'created_at': 'DESC'}),
     )
 
 
@@ -84,8 +93,8 @@ class AnalysisJob(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Job metadata
-    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False, index=True)
-    media_hash_id = Column(UUID(as_uuid=True), ForeignKey('media_hashes.id'), nullable=True, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
+    media_hash_id = Column(UUID(as_uuid=True), ForeignKey('media_hashes.id'), nullable=True)
     
     # Job status
     status = Column(String(20), default='queued', nullable=False, index=True)  # queued, processing, completed, failed
@@ -112,7 +121,7 @@ class AnalysisJob(Base):
     # User-provided metadata
     description = Column(Text, nullable=True)
     context = Column(Text, nullable=True)
-    metadata = Column(JSONB, nullable=True)
+    job_metadata = Column(JSONB, nullable=True)  # ``metadata`` is reserved by declarative models
     
     # Error handling
     error_message = Column(Text, nullable=True)
@@ -133,7 +142,9 @@ class AnalysisJob(Base):
     
     __table_args__ = (
         Index('idx_user_status', 'user_id', 'status'),
-        Index('idx_created_at_desc', 'created_at', postgresql_ops={'created_at': 'DESC'}),
+        Index('idx_analysis_jobs_created_desc', 'created_at', postgresql_ops={'created_at': 'DESC'}),
+        Index('idx_analysis_jobs_metadata_gin', 'job_metadata',
+              postgresql_using='gin', postgresql_ops={'job_metadata': 'jsonb_path_ops'}),
     )
 
 
@@ -147,11 +158,11 @@ class ContentReport(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Reporter info
-    reporter_user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False, index=True)
+    reporter_user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=False)
     reporter_email_encrypted = Column(String(500), nullable=True)  # Encrypted for privacy
     
     # Content identification
-    media_hash_id = Column(UUID(as_uuid=True), ForeignKey('media_hashes.id'), nullable=False, index=True)
+    media_hash_id = Column(UUID(as_uuid=True), ForeignKey('media_hashes.id'), nullable=False)
     
     # Report details
     report_type = Column(String(50), nullable=False, index=True)  # 'ncii', 'deepfake', 'csam', 'harassment'
@@ -176,7 +187,7 @@ class ContentReport(Base):
     
     # Status tracking
     status = Column(String(20), default='pending', nullable=False, index=True)  # pending, reviewing, approved, rejected, resolved
-    assigned_to_user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=True, index=True)
+    assigned_to_user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=True)
     
     # Review details
     reviewed_at = Column(DateTime, nullable=True)
@@ -205,7 +216,15 @@ class ContentReport(Base):
     __table_args__ = (
         Index('idx_status_priority', 'status', 'priority'),
         Index('idx_reporter_created', 'reporter_user_id', 'created_at'),
+        Index('idx_reporter_status_created', 'reporter_user_id', 'status', 'created_at',
+              postgresql_ops={'created_at': 'DESC'}),
         Index('idx_assigned_status', 'assigned_to_user_id', 'status'),
+        Index('idx_reports_evidence_data_gin', 'evidence_data',
+              postgresql_using='gin', postgresql_ops={'evidence_data': 'jsonb_path_ops'}),
+        # Array membership/overlap (&&, @>) on platform and evidence lists
+        Index('idx_reports_platform_names_gin', 'platform_names', postgresql_using='gin'),
+        Index('idx_reports_platform_urls_gin', 'platform_urls', postgresql_using='gin'),
+        Index('idx_reports_evidence_urls_gin', 'evidence_urls', postgresql_using='gin'),
     )
 
 
@@ -219,8 +238,8 @@ class TakedownRequest(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # Links
-    report_id = Column(UUID(as_uuid=True), ForeignKey('content_reports.id'), nullable=False, index=True)
-    media_hash_id = Column(UUID(as_uuid=True), ForeignKey('media_hashes.id'), nullable=False, index=True)
+    report_id = Column(UUID(as_uuid=True), ForeignKey('content_reports.id'), nullable=False)
+    media_hash_id = Column(UUID(as_uuid=True), ForeignKey('media_hashes.id'), nullable=False)
     
     # Platform details
     platform_name = Column(String(100), nullable=False, index=True)  # 'facebook', 'twitter', 'instagram', etc.
@@ -256,6 +275,10 @@ class TakedownRequest(Base):
     __table_args__ = (
         Index('idx_platform_status', 'platform_name', 'status'),
         Index('idx_report_created', 'report_id', 'created_at'),
+        Index('idx_takedown_request_payload_gin', 'request_payload',
+              postgresql_using='gin', postgresql_ops={'request_payload': 'jsonb_path_ops'}),
+        Index('idx_takedown_platform_response_gin', 'platform_response',
+              postgresql_using='gin', postgresql_ops={'platform_response': 'jsonb_path_ops'}),
     )
 
 
@@ -270,7 +293,7 @@ class HashMatch(Base):
     
     # Match details
     original_hash_id = Column(UUID(as_uuid=True), ForeignKey('media_hashes.id'), nullable=False, index=True)  # Hash from new upload
-    matched_hash_id = Column(UUID(as_uuid=True), ForeignKey('media_hashes.id'), nullable=False, index=True)  # Existing hash in database
+    matched_hash_id = Column(UUID(as_uuid=True), ForeignKey('media_hashes.id'), nullable=False)  # Existing hash in database
     
     # Similarity metrics
     hamming_distance = Column(Integer, nullable=False)  # 0-256 for PDQ
@@ -278,7 +301,7 @@ class HashMatch(Base):
     match_type = Column(String(20), nullable=False)  # 'exact', 'near', 'rotated', 'modified'
     
     # User who triggered the match
-    detected_by_user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=True, index=True)
+    detected_by_user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=True)
     
     # Context
     detection_context = Column(String(50), nullable=True)  # 'upload', 'api_check', 'bulk_scan'
@@ -288,7 +311,7 @@ class HashMatch(Base):
     action_taken = Column(String(50), nullable=True)  # 'blocked', 'flagged', 'allowed_with_warning'
     
     # Metadata
-    metadata = Column(JSONB, nullable=True)
+    match_metadata = Column(JSONB, nullable=True)  # ``metadata`` is reserved by declarative models
     
     # Timestamp
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
@@ -298,7 +321,12 @@ class HashMatch(Base):
     
     __table_args__ = (
         Index('idx_matched_created', 'matched_hash_id', 'created_at'),
+        # The analysis worker claims a user's not-yet-linked matches
+        Index('idx_hash_matches_unlinked_user', 'detected_by_user_id',
+              postgresql_where=text('original_hash_id IS NULL')),
         Index('idx_similarity_score', 'similarity_score', postgresql_ops={'similarity_score': 'DESC'}),
+        Index('idx_hash_matches_metadata_gin', 'match_metadata',
+              postgresql_using='gin', postgresql_ops={'match_metadata': 'jsonb_path_ops'}),
     )
 
 
@@ -317,7 +345,7 @@ class AuditLog(Base):
     resource_id = Column(UUID(as_uuid=True), nullable=True, index=True)
     
     # Actor
-    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=True, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), nullable=True)
     user_email_encrypted = Column(String(500), nullable=True)
     user_role = Column(String(50), nullable=True)
     
@@ -333,14 +361,230 @@ class AuditLog(Base):
     # Additional context
     details = Column(JSONB, nullable=True)
     
-    # Timestamp
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # Timestamp (part of the primary key: PostgreSQL requires the partition
+    # key in every unique constraint of a partitioned table)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, primary_key=True)
     
-    # Partitioning hint for large tables
+    # Indexes declared here are created on the parent and propagate to
+    # every monthly partition. Index names are schema-wide in PostgreSQL,
+    # so the ones shared with the app's audit_logs model carry a stopncii_
+    # prefix
     __table_args__ = (
+        # Append-only and insertion-ordered: BRIN keeps one summary per page
+        # range instead of one entry per row
+        Index('ix_stopncii_audit_logs_created_at_brin', 'created_at',
+              postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
         Index('idx_action_created', 'action', 'created_at'),
         Index('idx_user_action', 'user_id', 'action'),
         Index('idx_resource', 'resource_type', 'resource_id'),
-        # Partition by month for audit logs
-        {'postgresql_partition_by': 'RANGE (created_at)'}  # Requires manual partition creation
+        Index('idx_stopncii_audit_logs_details_gin', 'details',
+              postgresql_using='gin', postgresql_ops={'details': 'jsonb_path_ops'}),
+        # GIN above only serves @>; ->> equality on a known key needs its own
+        # B-Tree expression index (job_id is written by process_media_file)
+        Index('idx_audit_logs_details_job_id', text("(details->>'job_id')")),
+        # Partition by month for audit logs; see create_audit_log_partitions()
+        {'postgresql_partition_by': 'RANGE (created_at)'}
+    )
+
+
+# Number of monthly audit_logs partitions kept ahead of the current month
+AUDIT_LOG_PARTITIONS_AHEAD = 12
+
+
+def audit_log_partition_ddl(year: int, month: int) -> str:
+    """
+    Build the DDL for one monthly audit_logs partition.
+    
+    Idempotent (IF NOT EXISTS), so it is safe to run from both table
+    creation and the periodic rollover task.
+    """
+    start = datetime(year, month, 1)
+    end = datetime(year + (month == 12), month % 12 + 1, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS audit_logs_{year:04d}_{month:02d} "
+        f"PARTITION OF audit_logs "
+        f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+    )
+
+
+def create_audit_log_partitions(connection, months_ahead: int = AUDIT_LOG_PARTITIONS_AHEAD,
+                                start: datetime = None) -> int:
+    """
+    Create the audit_logs partitions for the current month and the
+    following ``months_ahead - 1`` months. Returns the number of
+    partition statements issued.
+    """
+    if connection.dialect.name != 'postgresql':
+        return 0
+    
+    start = start or datetime.utcnow()
+    year, month = start.year, start.month
+    for _ in range(months_ahead):
+        connection.execute(text(audit_log_partition_ddl(year, month)))
+        year, month = year + (month == 12), month % 12 + 1
+    return months_ahead
+
+
+@event.listens_for(AuditLog.__table__, 'after_create')
+def _create_initial_audit_log_partitions(target, connection, **kw):
+    """A partitioned parent accepts no rows until a partition exists"""
+    create_audit_log_partitions(connection)
+
+
+# Keep the free-text columns out of the dashboard's hot path: EXTERNAL moves
+# large values out of line uncompressed, so list queries that only read
+# id/status/priority never pay for decompressing them.
+event.listen(
+    ContentReport.__table__,
+    'after_create',
+    DDL(
+        "ALTER TABLE content_reports "
+        "ALTER COLUMN description SET STORAGE EXTERNAL, "
+        "ALTER COLUMN review_notes SET STORAGE EXTERNAL, "
+        "ALTER COLUMN rejection_reason SET STORAGE EXTERNAL"
+    ).execute_if(dialect='postgresql')
+)
+
+
+def create_schema(bind) -> None:
+    """
+    Create every StopNCII table, index and audit_logs partition in a
+    single transaction.
+    
+    PostgreSQL DDL is transactional, so a failure part-way leaves no
+    half-built schema behind and the catalog is committed once instead of
+    per statement. ``users`` is owned by ``app.models.database``; it is
+    reflected first so the foreign keys resolve.
+    """
+    with bind.begin() as conn:
+        Base.metadata.reflect(bind=conn, only=['users'], extend_existing=True)
+        Base.metadata.create_all(conn)
+
+
+def rename_metadata_columns(bind) -> None:
+    """
+    Upgrade databases created while the JSONB columns were still named
+    ``metadata`` (analysis_jobs -> job_metadata, hash_matches ->
+    match_metadata).
+    
+    Both renames run in one transaction; RENAME COLUMN only updates the
+    catalog, so the exclusive lock is held for milliseconds regardless of
+    table size and dependent indexes follow the column.
+    """
+    renames = (('analysis_jobs', 'job_metadata'), ('hash_matches', 'match_metadata'))
+    with bind.begin() as conn:
+        inspector = inspect(conn)
+        for table, new_name in renames:
+            if not inspector.has_table(table):
+                continue
+            if 'metadata' in {c['name'] for c in inspector.get_columns(table)}:
+                conn.execute(text(f"ALTER TABLE {table} RENAME COLUMN metadata TO {new_name}"))
+
+
+def create_indexes_concurrently(bind) -> None:
+    """
+    Build any missing StopNCII indexes on an already-populated database
+    without taking write locks.
+    
+    CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so
+    this uses an autocommit connection. Partitioned tables are skipped
+    (PostgreSQL does not support CONCURRENTLY on a partitioned parent).
+    Expect roughly 1-2 seconds per million rows per B-Tree index and
+    several times that for GIN.
+    """
+    if bind.dialect.name != 'postgresql':
+        return
+    
+    with bind.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name == 'users' or table.dialect_options['postgresql'].get('partition_by'):
+                continue
+            for index in table.indexes:
+                ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=conn.dialect))
+                conn.execute(text(ddl.replace(' INDEX ', ' INDEX CONCURRENTLY ', 1)))
+
+
+@contextmanager
+def bulk_load(connection, table: str):
+    """
+    Bulk-load/backfill ``table`` with WAL and trigger overhead switched off.
+    
+    The table is made UNLOGGED and its triggers (including FK checks) are
+    disabled for the duration of the block, then restored even if the load
+    fails. Wrap large INSERT/COPY backfills (e.g. recomputing the
+    media_hashes counters) with it.
+    
+    Caveats: an UNLOGGED table is truncated on crash recovery and is not
+    replicated until SET LOGGED rewrites it; PostgreSQL refuses SET
+    UNLOGGED on a table referenced by a logged table's foreign key, and
+    DISABLE TRIGGER ALL requires superuser. Data loaded here is not
+    FK-checked, so it must already be consistent.
+    """
+    if connection.dialect.name != 'postgresql':
+        yield
+        return
+    
+    name = connection.dialect.identifier_preparer.quote(table)
+    connection.execute(text(f"ALTER TABLE {name} SET UNLOGGED"))
+    connection.execute(text(f"ALTER TABLE {name} DISABLE TRIGGER ALL"))
+    try:
+        yield
+    finally:
+        connection.execute(text(f"ALTER TABLE {name} ENABLE TRIGGER ALL"))
+        connection.execute(text(f"ALTER TABLE {name} SET LOGGED"))
+
+
+def _copy_csv_field(value) -> str:
+    """
+    One COPY CSV field: NULL as an unquoted empty field, anything else
+    quoted, so empty strings and a literal \\N survive as text
+    """
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def bulk_copy(connection, table: str, columns, rows, batch_size: int = 5000) -> int:
+    """
+    Insert ``rows`` (tuples ordered like ``columns``) into ``table`` in
+    batches, using ``COPY ... FROM STDIN`` on PostgreSQL.
+    
+    Use this instead of per-row INSERTs / ``op.bulk_insert`` for large
+    backfills such as populating media_hashes; combine with bulk_load()
+    for the biggest loads. dict/list values are sent as JSON (JSONB
+    columns); ARRAY columns are not supported on the COPY path. Other
+    dialects fall back to batched executemany INSERTs. Returns the number
+    of rows written.
+    
+    The COPY path needs a synchronous psycopg2 connection (get_engine(),
+    migrations). The StopNCII worker's asyncpg engine has no copy_expert;
+    use asyncpg's ``copy_records_to_table`` there instead.
+    """
+    rows = iter(rows)
+    total = 0
+    
+    if connection.dialect.name != 'postgresql':
+        insert = Base.metadata.tables[table].insert()
+        while batch := list(islice(rows, batch_size)):
+            connection.execute(insert, [dict(zip(columns, row)) for row in batch])
+            total += len(batch)
+        return total
+    
+    preparer = connection.dialect.identifier_preparer
+    copy_sql = (
+        f"COPY {preparer.quote(table)} ({', '.join(preparer.quote(c) for c in columns)}) "
+        "FROM STDIN WITH (FORMAT csv)"
     )
+    cursor = connection.connection.cursor()
+    try:
+        while batch := list(islice(rows, batch_size)):
+            buf = io.StringIO(''.join(
+                ','.join(map(_copy_csv_field, row)) + '\n' for row in batch
+            ))
+            cursor.copy_expert(copy_sql, buf)
+            total += len(batch)
+    finally:
+        cursor.close()
+    return total
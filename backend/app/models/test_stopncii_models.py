@@ -0,0 +1,118 @@
+"""Tests for the StopNCII audit-log partitioning and bulk COPY helpers"""
+
+import io
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.stopncii_models import (
+    audit_log_partition_ddl,
+    bulk_copy,
+    create_audit_log_partitions,
+)
+
+
+class _RecordingCursor:
+    def __init__(self):
+        self.copies = []
+        self.closed = False
+
+    def copy_expert(self, sql: str, buf: io.StringIO):
+        self.copies.append((sql, buf.read()))
+
+    def close(self):
+        self.closed = True
+
+
+class _RecordingConnection:
+    """Just enough of a SQLAlchemy Connection for the COPY and DDL helpers"""
+
+    def __init__(self, dialect_name: str = "postgresql"):
+        self.dialect = SimpleNamespace(
+            name=dialect_name,
+            identifier_preparer=postgresql.dialect().identifier_preparer,
+        )
+        self.cursor = _RecordingCursor()
+        self.connection = SimpleNamespace(cursor=lambda: self.cursor)
+        self.statements = []
+
+    def execute(self, statement, *args):
+        self.statements.append(str(statement))
+
+
+# ============================================================================
+# audit_log_partition_ddl / create_audit_log_partitions
+# ============================================================================
+
+def test_partition_ddl_covers_one_calendar_month():
+    assert audit_log_partition_ddl(2024, 3) == (
+        "CREATE TABLE IF NOT EXISTS audit_logs_2024_03 "
+        "PARTITION OF audit_logs "
+        "FOR VALUES FROM ('2024-03-01') TO ('2024-04-01')"
+    )
+
+
+def test_partition_ddl_december_ends_in_next_year():
+    ddl = audit_log_partition_ddl(2024, 12)
+    assert "audit_logs_2024_12 " in ddl
+    assert "FROM ('2024-12-01') TO ('2025-01-01')" in ddl
+
+
+def test_create_partitions_rolls_over_the_year():
+    connection = _RecordingConnection()
+
+    created = create_audit_log_partitions(connection, months_ahead=3, start=datetime(2024, 11, 15))
+
+    assert created == 3
+    assert connection.statements == [
+        audit_log_partition_ddl(2024, 11),
+        audit_log_partition_ddl(2024, 12),
+        audit_log_partition_ddl(2025, 1),
+    ]
+
+
+def test_create_partitions_is_a_no_op_off_postgresql():
+    connection = _RecordingConnection(dialect_name="sqlite")
+
+    assert create_audit_log_partitions(connection, months_ahead=3) == 0
+    assert connection.statements == []
+
+
+# ============================================================================
+# bulk_copy
+# ============================================================================
+
+def test_bulk_copy_sends_null_unquoted_and_every_value_quoted():
+    connection = _RecordingConnection()
+    rows = [
+        ("abc", None, 1),
+        ("", "\\N", 2.5),
+        ('say "hi", twice', {"k": [1, 2]}, True),
+    ]
+
+    written = bulk_copy(connection, "media_hashes", ["hash_value", "resolution", "file_size_bytes"], rows)
+
+    assert written == 3
+    (sql, data), = connection.cursor.copies
+    assert sql == "COPY media_hashes (hash_value, resolution, file_size_bytes) FROM STDIN WITH (FORMAT csv)"
+    assert data.splitlines() == [
+        '"abc",,"1"',
+        '"","\\N","2.5"',
+        '"say ""hi"", twice","{""k"": [1, 2]}","True"',
+    ]
+
+
+def test_bulk_copy_streams_in_batches_and_closes_the_cursor():
+    connection = _RecordingConnection()
+    rows = ((str(i),) for i in range(5))
+
+    written = bulk_copy(connection, "media_hashes", ["hash_value"], rows, batch_size=2)
+
+    assert written == 5
+    assert [data.splitlines() for _, data in connection.cursor.copies] == [
+        ['"0"', '"1"'],
+        ['"2"', '"3"'],
+        ['"4"'],
+    ]
+    assert connection.cursor.closed
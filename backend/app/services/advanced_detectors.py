@@ -9,18 +9,36 @@ import librosa
 from scipy import signal, fftpack
 from skimage.metrics import structural_similarity as ssim
 from skimage import measure, morphology
-from PIL import Image, ImageChops, ImageEnhance
+from PIL import Image, ImageChops, ImageEnhance, ImageStat
 import torch
 from typing import Dict, List, Tuple, Optional, Any
 import logging
 from dataclasses import dataclass
 from datetime import datetime
 import hashlib
+import io
 import json
+import asyncio
+import functools
+import os
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _pass_pool() -> ThreadPoolExecutor:
+    """
+    Threads for running the independent passes of one analysis side by
+    side. OpenCV and NumPy release the GIL inside their kernels, so the
+    passes genuinely overlap.
+    """
+    return ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="detector-pass")
+
+
 @dataclass
 class DetectionResult:
     """Structured detection result"""
@@ -34,6 +52,29 @@ class DetectionResult:
     forensic_metrics: Dict[str, float]
     processing_time: float
     timestamp: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """All fields as a shallow dict (dataclasses.asdict deep-copies)"""
+        return dict(self.__dict__)
+    
+    def summary(self) -> Dict[str, Any]:
+        """Verdict fields returned to API clients"""
+        return {
+            "is_fake": self.is_fake,
+            "confidence": self.confidence,
+            "fake_probability": self.fake_probability,
+            "real_probability": self.real_probability,
+            "detection_method": self.detection_method
+        }
+    
+    def evidence_summary(self) -> Dict[str, Any]:
+        """Fields recorded in an evidence chain block"""
+        return {
+            "is_fake": self.is_fake,
+            "confidence": self.confidence,
+            "fake_probability": self.fake_probability,
+            "anomalies": self.anomalies_found
+        }
 
 
 class AdvancedVideoDetector:
@@ -48,9 +89,19 @@ class AdvancedVideoDetector:
     """
     
     def __init__(self):
-        self.face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        )
+        # One process-wide detector serves concurrent analyses, and a
+        # CascadeClassifier is not safe to share between threads
+        self._cascades = threading.local()
+    
+    @property
+    def face_cascade(self) -> cv2.CascadeClassifier:
+        """This thread's Haar face cascade, loaded on first use"""
+        cascade = getattr(self._cascades, "cascade", None)
+        if cascade is None:
+            cascade = self._cascades.cascade = cv2.CascadeClassifier(
+                cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+            )
+        return cascade
         
     def analyze_video(self, video_path: str) -> DetectionResult:
         """Comprehensive video deepfake analysis"""
@@ -77,13 +128,25 @@ class AdvancedVideoDetector:
         if len(frames) < 10:
             raise ValueError("Video too short for analysis")
         
-        # Run multiple detection algorithms
-        freq_score = self._frequency_analysis(frames)
-        temporal_score = self._temporal_consistency(frames)
-        compression_score = self._compression_artifacts(frames)
-        face_score = self._face_region_analysis(frames)
-        motion_score = self._optical_flow_analysis(frames)
-        noise_score = self._noise_pattern_analysis(frames)
+        # Convert to grayscale once, into one contiguous (N, H, W) buffer;
+        # every analysis except the face pass works on luminance only
+        gray_frames = np.empty((len(frames),) + frames[0].shape[:2], dtype=np.uint8)
+        for i, frame in enumerate(frames):
+            gray_frames[i] = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        
+        # Run multiple detection algorithms concurrently; they only read
+        # the shared frame buffers
+        pool = _pass_pool()
+        passes = [
+            pool.submit(self._frequency_analysis, gray_frames),
+            pool.submit(self._temporal_consistency, gray_frames),
+            pool.submit(self._compression_artifacts, gray_frames),
+            pool.submit(self._face_region_analysis, frames, gray_frames),
+            pool.submit(self._optical_flow_analysis, gray_frames),
+            pool.submit(self._noise_pattern_analysis, gray_frames),
+        ]
+        (freq_score, temporal_score, compression_score,
+         face_score, motion_score, noise_score) = [p.result() for p in passes]
         
         # Combine scores with weighted average
         weights = {
@@ -153,16 +216,14 @@ class AdvancedVideoDetector:
             timestamp=datetime.now().isoformat()
         )
     
-    def _frequency_analysis(self, frames: List[np.ndarray]) -> Dict:
+    def _frequency_analysis(self, gray_frames: np.ndarray) -> Dict:
         """
         Frequency domain analysis using DCT and FFT
         Detects GAN artifacts in frequency spectrum
         """
         dct_anomalies = []
         
-        for frame in frames[::5]:  # Sample every 5th frame
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            
+        for gray in gray_frames[::5]:  # Sample every 5th frame
             # Apply DCT
             dct = cv2.dct(np.float32(gray))
             
@@ -190,17 +251,14 @@ class AdvancedVideoDetector:
             'description': f"High-frequency variance: {mean_anomaly:.4f} (threshold: 0.15)"
         }
     
-    def _temporal_consistency(self, frames: List[np.ndarray]) -> Dict:
+    def _temporal_consistency(self, gray_frames: np.ndarray) -> Dict:
         """
         Analyze temporal consistency between frames
         Real videos have smooth transitions; deepfakes may have frame discontinuities
         """
         frame_diffs = []
         
-        for i in range(len(frames) - 1):
-            gray1 = cv2.cvtColor(frames[i], cv2.COLOR_BGR2GRAY)
-            gray2 = cv2.cvtColor(frames[i + 1], cv2.COLOR_BGR2GRAY)
-            
+        for gray1, gray2 in zip(gray_frames[:-1], gray_frames[1:]):
             # Calculate structural similarity
             similarity = ssim(gray1, gray2)
             frame_diffs.append(1.0 - similarity)
@@ -222,18 +280,16 @@ class AdvancedVideoDetector:
             'description': f"Temporal variance: {consistency_score:.4f}, max diff: {max_diff:.4f}"
         }
     
-    def _compression_artifacts(self, frames: List[np.ndarray]) -> Dict:
+    def _compression_artifacts(self, gray_frames: np.ndarray) -> Dict:
         """
         Detect unusual compression artifacts
         Deepfakes may show different compression patterns than real videos
         """
         artifact_scores = []
         
-        for frame in frames[::10]:  # Sample frames
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            
+        for gray in gray_frames[::10]:  # Sample frames
             # Detect blockiness (JPEG artifacts)
-            laplacian = cv2.Laplacian(gray, cv2.CV_64F)
+            laplacian = cv2.Laplacian(gray, cv2.CV_32F)
             variance = np.var(laplacian)
             
             # Edge detection
@@ -257,7 +313,7 @@ class AdvancedVideoDetector:
             'description': f"Artifact variance: {std_artifacts:.2f}, mean: {mean_artifacts:.2f}"
         }
     
-    def _face_region_analysis(self, frames: List[np.ndarray]) -> Dict:
+    def _face_region_analysis(self, frames: List[np.ndarray], gray_frames: np.ndarray) -> Dict:
         """
         Analyze face regions for anomalies
         Deepfakes often show inconsistencies in face boundaries
@@ -265,8 +321,7 @@ class AdvancedVideoDetector:
         face_anomalies = []
         faces_detected = 0
         
-        for frame in frames[::3]:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        for frame, gray in zip(frames[::3], gray_frames[::3]):
             faces = self.face_cascade.detectMultiScale(gray, 1.1, 4)
             
             if len(faces) > 0:
@@ -276,7 +331,7 @@ class AdvancedVideoDetector:
                     face_roi = frame[y:y+h, x:x+w]
                     
                     # Analyze face boundary sharpness
-                    edges = cv2.Canny(cv2.cvtColor(face_roi, cv2.COLOR_BGR2GRAY), 100, 200)
+                    edges = cv2.Canny(gray[y:y+h, x:x+w], 100, 200)
                     edge_ratio = np.sum(edges > 0) / edges.size
                     
                     # Check color consistency
@@ -305,16 +360,16 @@ class AdvancedVideoDetector:
             'description': f"Face boundary anomaly: {mean_anomaly:.4f}, faces: {faces_detected}"
         }
     
-    def _optical_flow_analysis(self, frames: List[np.ndarray]) -> Dict:
+    def _optical_flow_analysis(self, gray_frames: np.ndarray) -> Dict:
         """
         Analyze optical flow for motion consistency
         Deepfakes may have unnatural motion patterns
         """
         flow_magnitudes = []
         
-        for i in range(0, len(frames) - 1, 5):
-            prev = cv2.cvtColor(frames[i], cv2.COLOR_BGR2GRAY)
-            next_frame = cv2.cvtColor(frames[i + 1], cv2.COLOR_BGR2GRAY)
+        for i in range(0, len(gray_frames) - 1, 5):
+            prev = gray_frames[i]
+            next_frame = gray_frames[i + 1]
             
             # Calculate optical flow
             flow = cv2.calcOpticalFlowFarneback(
@@ -342,16 +397,14 @@ class AdvancedVideoDetector:
             'description': f"Motion inconsistency: {motion_consistency:.4f}"
         }
     
-    def _noise_pattern_analysis(self, frames: List[np.ndarray]) -> Dict:
+    def _noise_pattern_analysis(self, gray_frames: np.ndarray) -> Dict:
         """
         Analyze noise patterns in frames
         GANs produce different noise characteristics than real cameras
         """
         noise_scores = []
         
-        for frame in frames[::8]:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            
+        for gray in gray_frames[::8]:
             # Estimate noise using high-pass filter
             gaussian = cv2.GaussianBlur(gray, (5, 5), 0)
             noise = cv2.subtract(gray, gaussian)
@@ -388,6 +441,20 @@ class AdvancedAudioDetector:
     - Phase consistency analysis
     """
     
+    def warmup(self, sr: int = 16000):
+        """
+        Run every analysis once on a second of synthetic audio.
+        
+        librosa JIT-compiles its numba kernels on first use, which would
+        otherwise land on the first real request.
+        """
+        y = np.random.default_rng(0).standard_normal(sr).astype(np.float32) * 0.1
+        self._spectral_analysis(y, sr)
+        self._prosody_analysis(y, sr)
+        self._phase_consistency(y, sr)
+        self._artifact_detection(y, sr)
+        self._formant_analysis(y, sr)
+    
     def analyze_audio(self, audio_path: str) -> DetectionResult:
         """Comprehensive audio deepfake analysis"""
         start_time = datetime.now()
@@ -588,24 +655,33 @@ class AdvancedAudioDetector:
         # Get LPC coefficients
         frame_length = 2048
         hop_length = 512
+        lpc_order = 12
         
+        # All frames at once: (n_frames, frame_length)
+        n_frames = max(0, -(-(len(y) - frame_length) // hop_length))
         formant_consistency = []
         
-        for i in range(0, len(y) - frame_length, hop_length):
-            frame = y[i:i+frame_length]
+        if n_frames > 0:
+            frames = librosa.util.frame(y, frame_length=frame_length, hop_length=hop_length, axis=0)[:n_frames]
             
-            # Linear prediction coefficients
-            lpc_order = 12
-            lpc = librosa.lpc(frame, order=lpc_order)
+            # Linear prediction coefficients, one row per frame
+            lpc = librosa.lpc(frames, order=lpc_order, axis=-1)
             
-            # Formant tracking via LPC roots
-            roots = np.roots(lpc)
-            roots = roots[np.imag(roots) >= 0]
+            # Formant tracking via LPC roots: eigenvalues of each frame's
+            # companion matrix (what np.roots computes), in one batched call
+            companion = np.zeros((n_frames, lpc_order, lpc_order), dtype=lpc.dtype)
+            companion[:, 0, :] = -lpc[:, 1:] / lpc[:, :1]
+            companion[:, np.arange(1, lpc_order), np.arange(lpc_order - 1)] = 1
+            roots = np.linalg.eigvals(companion)
             
-            if len(roots) > 0:
-                angles = np.arctan2(np.imag(roots), np.real(roots))
-                formants = sorted(angles * (sr / (2 * np.pi)))
-                formant_consistency.append(np.std(formants) if len(formants) > 1 else 0)
+            # Spread of the upper-half-plane root frequencies per frame
+            upper = np.imag(roots) >= 0
+            formants = np.arctan2(np.imag(roots), np.real(roots)) * (sr / (2 * np.pi))
+            counts = upper.sum(axis=1)
+            valid = counts > 0
+            means = np.where(upper, formants, 0).sum(axis=1)[valid] / counts[valid]
+            spreads = np.where(upper[valid], formants[valid] - means[:, None], 0)
+            formant_consistency = np.sqrt((spreads ** 2).sum(axis=1) / counts[valid])
         
         if len(formant_consistency) == 0:
             return {
@@ -648,16 +724,18 @@ class AdvancedImageDetector:
         """Comprehensive image manipulation analysis"""
         start_time = datetime.now()
         
-        # Load image
+        # Load and decode the image once; every analysis reuses it
         img = Image.open(image_path)
+        img.load()
         img_array = np.array(img)
+        rgb = img.convert('RGB')
         
         # Run detection algorithms
-        ela_score = self._error_level_analysis(image_path)
+        ela_score = self._error_level_analysis(img, rgb)
         noise_score = self._noise_analysis(img_array)
-        jpeg_score = self._jpeg_ghost_detection(image_path)
+        jpeg_score = self._jpeg_ghost_detection(img, rgb)
         clone_score = self._clone_detection(img_array)
-        metadata_score = self._metadata_analysis(image_path)
+        metadata_score = self._metadata_analysis(img)
         
         # Weighted combination
         weights = {
@@ -723,22 +801,17 @@ class AdvancedImageDetector:
             timestamp=datetime.now().isoformat()
         )
     
-    def _error_level_analysis(self, image_path: str) -> Dict:
+    def _error_level_analysis(self, img: Image.Image, rgb: Image.Image) -> Dict:
         """
         Error Level Analysis - detects compression inconsistencies
         """
-        # Load original
-        img = Image.open(image_path)
-        
-        # Resave at known quality
-        import io
+        # Resave at known quality (a JPEG of an RGB image decodes as RGB)
         buffer = io.BytesIO()
-        img.save(buffer, 'JPEG', quality=90)
-        buffer.seek(0)
+        rgb.save(buffer, 'JPEG', quality=90)
         resaved = Image.open(buffer)
         
         # Calculate difference
-        diff = ImageChops.difference(img.convert('RGB'), resaved.convert('RGB'))
+        diff = ImageChops.difference(rgb, resaved)
         extrema = diff.getextrema()
         
         # ELA score: manipulated areas show different error levels
@@ -779,7 +852,7 @@ class AdvancedImageDetector:
                 
                 # Estimate noise
                 gaussian = cv2.GaussianBlur(block, (5, 5), 0)
-                noise = block.astype(float) - gaussian.astype(float)
+                noise = np.subtract(block, gaussian, dtype=np.float32)
                 noise_var = np.var(noise)
                 noise_variances.append(noise_var)
         
@@ -798,24 +871,22 @@ class AdvancedImageDetector:
             'description': f"Noise inconsistency: {noise_consistency:.4f}"
         }
     
-    def _jpeg_ghost_detection(self, image_path: str) -> Dict:
+    def _jpeg_ghost_detection(self, img: Image.Image, rgb: Image.Image) -> Dict:
         """
         Detect JPEG ghosts (signs of multiple compression)
         """
-        img = Image.open(image_path)
-        
         ghosts = []
         
+        # Recompress the already-converted RGB copy, so no quality level
+        # converts the image again, and average each difference from its
+        # histogram rather than copying it into an array
         for quality in [95, 90, 85, 80, 75, 70]:
-            import io
             buffer = io.BytesIO()
-            img.save(buffer, 'JPEG', quality=quality)
-            buffer.seek(0)
+            rgb.save(buffer, 'JPEG', quality=quality)
             recompressed = Image.open(buffer)
             
-            diff = ImageChops.difference(img.convert('RGB'), recompressed.convert('RGB'))
-            diff_array = np.array(diff)
-            ghost_score = np.mean(diff_array)
+            diff = ImageChops.difference(rgb, recompressed)
+            ghost_score = float(np.mean(ImageStat.Stat(diff).mean))
             ghosts.append(ghost_score)
         
         # Look for quality level with minimum difference
@@ -878,13 +949,12 @@ class AdvancedImageDetector:
             'description': f"Clone matches: {clone_matches}, ratio: {clone_ratio:.3f}"
         }
     
-    def _metadata_analysis(self, image_path: str) -> Dict:
+    def _metadata_analysis(self, img: Image.Image) -> Dict:
         """
         Analyze image metadata for manipulation signs
         """
         from PIL.ExifTags import TAGS
         
-        img = Image.open(image_path)
         exif = img.getexif()
         
         metadata = {}
@@ -928,8 +998,9 @@ class AdvancedImageDetector:
 
 
 # Export main detectors
+@functools.lru_cache(maxsize=None)
 def get_advanced_detector(media_type: str):
-    """Get appropriate advanced detector"""
+    """Get the process-wide advanced detector for ``media_type``"""
     if media_type == 'video':
         return AdvancedVideoDetector()
     elif media_type == 'audio':
@@ -938,3 +1009,127 @@ def get_advanced_detector(media_type: str):
         return AdvancedImageDetector()
     else:
         raise ValueError(f"Unsupported media type: {media_type}")
+
+
+_ANALYZE_METHODS = {
+    'video': 'analyze_video',
+    'audio': 'analyze_audio',
+    'image': 'analyze_image',
+}
+
+
+# Upper bound on detector runs executing at once in this process; each
+# run holds decoded frames/spectrograms in memory for its whole duration
+MAX_CONCURRENT_ANALYSES = int(os.getenv("ADVANCED_MAX_CONCURRENT_ANALYSES", str(os.cpu_count() or 4)))
+
+_analysis_slots = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+
+
+def _file_digest(path: str) -> str:
+    """SHA-256 of a file"""
+    with open(path, 'rb') as f:
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+
+
+def _stage_run_input(path: str) -> str:
+    """
+    Give an analysis run its own name for ``path`` (a hard link, or a copy
+    across filesystems), so the request that staged the upload may delete
+    it while the shared run still reads it
+    """
+    root, ext = os.path.splitext(path)
+    run_path = f"{root}.run-{uuid.uuid4().hex}{ext}"
+    try:
+        os.link(path, run_path)
+    except OSError:
+        shutil.copyfile(path, run_path)
+    return run_path
+
+
+def _remove_run_input(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove analysis input {path}: {e}")
+
+
+def _discard_staged_input(staging: asyncio.Future) -> None:
+    if not staging.cancelled() and staging.exception() is None:
+        _remove_run_input(staging.result())
+
+
+class CoalescingDetector:
+    """
+    Async front end for an advanced detector.
+    
+    The detectors are classical CV/DSP pipelines with no model forward
+    pass to batch, so instead of batching, concurrent requests for
+    byte-identical media (client retries, the same clip reported by
+    several users) are folded into one analysis run whose result every
+    waiter shares. The analysis runs in a worker thread, at most
+    ``MAX_CONCURRENT_ANALYSES`` at a time across all media types, on its
+    own link to the input that it removes when done.
+    """
+    
+    def __init__(self, media_type: str):
+        self.media_type = media_type
+        self.detector = get_advanced_detector(media_type)
+        self._analyze = getattr(self.detector, _ANALYZE_METHODS[media_type])
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    async def analyze(self, path: str) -> DetectionResult:
+        """Analyze ``path``, joining an in-flight run for the same content"""
+        result, _ = await self.analyze_with_digest(path)
+        return result
+    
+    async def analyze_with_digest(self, path: str) -> Tuple[DetectionResult, str]:
+        """Like ``analyze``, also returning the SHA-256 hex digest of the file"""
+        key = await asyncio.to_thread(_file_digest, path)
+        
+        future = self._inflight.get(key)
+        if future is None:
+            staging = asyncio.ensure_future(asyncio.to_thread(_stage_run_input, path))
+            try:
+                run_path = await asyncio.shield(staging)
+            except asyncio.CancelledError:
+                # The link is still made; remove it once it exists
+                staging.add_done_callback(_discard_staged_input)
+                raise
+            # Another request may have started the run while we linked
+            future = self._inflight.get(key)
+            if future is None:
+                future = asyncio.ensure_future(self._run(run_path))
+                self._inflight[key] = future
+                future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            else:
+                _remove_run_input(run_path)
+        
+        # Shielded so one cancelled request does not cancel the shared run
+        return await asyncio.shield(future), key
+    
+    async def _run(self, path: str) -> DetectionResult:
+        try:
+            async with _analysis_slots:
+                return await asyncio.to_thread(self._analyze, path)
+        finally:
+            await asyncio.to_thread(_remove_run_input, path)
+
+
+@functools.lru_cache(maxsize=None)
+def get_coalescing_detector(media_type: str) -> CoalescingDetector:
+    """Get the process-wide coalescing front end for ``media_type``"""
+    if media_type not in _ANALYZE_METHODS:
+        raise ValueError(f"Unsupported media type: {media_type}")
+    return CoalescingDetector(media_type)
+
+
+def warm_up_detectors():
+    """Build every detector up front and pay one-off initialization costs"""
+    for media_type in _ANALYZE_METHODS:
+        get_coalescing_detector(media_type)
+    try:
+        get_advanced_detector('audio').warmup()
+    except Exception as e:
+        logger.warning(f"Audio detector warm-up failed: {e}")
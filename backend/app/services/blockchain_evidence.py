@@ -10,6 +10,7 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 import logging
 from pathlib import Path
+import threading
 import uuid
 
 logger = logging.getLogger(__name__)
@@ -45,6 +46,11 @@ class BlockchainEvidenceChain:
         self.case_id = case_id
         self.investigator_id = investigator_id
         self.chain: List[EvidenceBlock] = []
+        # Serializes appends; requests for one case may add evidence from
+        # several worker threads at once
+        self._lock = threading.Lock()
+        # Number of leading blocks already verified intact in this process
+        self._verified_length = 1
         self.chain_file = Path(f"evidence_chains/case_{case_id}.json")
         self.chain_file.parent.mkdir(exist_ok=True)
         
@@ -78,15 +84,31 @@ class BlockchainEvidenceChain:
         evidence_path: str,
         evidence_type: str,
         detection_result: Dict[str, Any],
-        file_metadata: Dict[str, Any]
+        file_metadata: Dict[str, Any],
+        evidence_hash: Optional[str] = None
     ) -> EvidenceBlock:
         """
         Add new evidence to the chain
         Creates cryptographic link to previous block
+        
+        Pass ``evidence_hash`` (SHA-256 hex of the file) when the caller
+        has already hashed the file, to skip reading it again.
         """
         # Calculate file hash
-        evidence_hash = self._calculate_file_hash(evidence_path)
+        if evidence_hash is None:
+            evidence_hash = self._calculate_file_hash(evidence_path)
         
+        with self._lock:
+            return self._append_block(evidence_type, evidence_hash, detection_result, file_metadata)
+    
+    def _append_block(
+        self,
+        evidence_type: str,
+        evidence_hash: str,
+        detection_result: Dict[str, Any],
+        file_metadata: Dict[str, Any]
+    ) -> EvidenceBlock:
+        """Link a block for an already-hashed evidence file onto the chain"""
         # Get previous block
         previous_block = self.chain[-1]
         previous_hash = previous_block.block_hash
@@ -130,12 +152,21 @@ class BlockchainEvidenceChain:
         logger.info(f"Added evidence block {block_id} to case {self.case_id}")
         return new_block
     
-    def verify_chain_integrity(self) -> Dict[str, Any]:
+    def verify_chain_integrity(self, incremental: bool = False) -> Dict[str, Any]:
         """
         Verify the entire chain's integrity
         Returns verification report
+        
+        With ``incremental``, only blocks appended since the last clean
+        verification are re-hashed, so checking the chain after each
+        append costs O(new blocks) instead of O(chain length).
         """
-        if len(self.chain) == 0:
+        # Appends come from worker threads; verify a consistent snapshot
+        with self._lock:
+            chain = list(self.chain)
+            start = max(self._verified_length if incremental else 1, 1)
+        
+        if len(chain) == 0:
             return {
                 'valid': False,
                 'error': 'Empty chain',
@@ -144,10 +175,12 @@ class BlockchainEvidenceChain:
         
         issues = []
         
+        chain_length = len(chain)
+        
         # Verify each block
-        for i in range(1, len(self.chain)):
-            current = self.chain[i]
-            previous = self.chain[i - 1]
+        for i in range(start, chain_length):
+            current = chain[i]
+            previous = chain[i - 1]
             
             # Check previous hash link
             if current.previous_hash != previous.block_hash:
@@ -183,15 +216,18 @@ class BlockchainEvidenceChain:
                 })
         
         is_valid = len(issues) == 0
+        if is_valid:
+            with self._lock:
+                self._verified_length = max(self._verified_length, chain_length)
         
         return {
             'valid': is_valid,
-            'chain_length': len(self.chain),
-            'blocks_verified': len(self.chain),
+            'chain_length': chain_length,
+            'blocks_verified': max(chain_length - start, 0),
             'issues': issues,
             'verification_time': datetime.now().isoformat(),
             'case_id': self.case_id,
-            'genesis_block': self.chain[0].block_hash
+            'genesis_block': chain[0].block_hash
         }
     
     def get_chain_summary(self) -> Dict[str, Any]:
@@ -264,16 +300,11 @@ class BlockchainEvidenceChain:
     
     def _calculate_file_hash(self, file_path: str) -> str:
         """Calculate SHA-256 hash of file"""
-        sha256 = hashlib.sha256()
-        
         try:
+            # file_digest reads into one reused buffer and hashes in OpenSSL
+            # (SHA-NI where the CPU has it) without holding the GIL
             with open(file_path, 'rb') as f:
-                while True:
-                    data = f.read(65536)  # 64KB chunks
-                    if not data:
-                        break
-                    sha256.update(data)
-            return sha256.hexdigest()
+                return hashlib.file_digest(f, 'sha256').hexdigest()
         except Exception as e:
             logger.error(f"Error hashing file {file_path}: {e}")
             return hashlib.sha256(file_path.encode()).hexdigest()
@@ -353,7 +384,8 @@ class EvidenceManager:
         evidence_path: str,
         evidence_type: str,
         detection_result: Dict[str, Any],
-        file_metadata: Dict[str, Any]
+        file_metadata: Dict[str, Any],
+        evidence_hash: Optional[str] = None
     ) -> EvidenceBlock:
         """Add evidence to existing case"""
         chain = self.get_chain(case_id)
@@ -364,16 +396,17 @@ class EvidenceManager:
             evidence_path,
             evidence_type,
             detection_result,
-            file_metadata
+            file_metadata,
+            evidence_hash
         )
     
-    def verify_case_integrity(self, case_id: str) -> Dict[str, Any]:
+    def verify_case_integrity(self, case_id: str, incremental: bool = False) -> Dict[str, Any]:
         """Verify integrity of case evidence chain"""
         chain = self.get_chain(case_id)
         if not chain:
             return {'valid': False, 'error': f'Case {case_id} not found'}
         
-        return chain.verify_chain_integrity()
+        return chain.verify_chain_integrity(incremental=incremental)
     
     def export_case_report(self, case_id: str) -> Dict[str, Any]:
         """Export legal report for case"""
@@ -420,7 +453,8 @@ def add_evidence(
     evidence_path: str,
     evidence_type: str,
     detection_result: Dict[str, Any],
-    file_metadata: Dict[str, Any]
+    file_metadata: Dict[str, Any],
+    evidence_hash: Optional[str] = None
 ) -> EvidenceBlock:
     """Add evidence to case"""
     return evidence_manager.add_evidence_to_case(
@@ -428,13 +462,14 @@ def add_evidence(
         evidence_path,
         evidence_type,
         detection_result,
-        file_metadata
+        file_metadata,
+        evidence_hash
     )
 
 
-def verify_evidence_chain(case_id: str) -> Dict[str, Any]:
+def verify_evidence_chain(case_id: str, incremental: bool = False) -> Dict[str, Any]:
     """Verify evidence chain integrity"""
-    return evidence_manager.verify_case_integrity(case_id)
+    return evidence_manager.verify_case_integrity(case_id, incremental=incremental)
 
 
 def export_legal_report(case_id: str) -> Dict[str, Any]:
@@ -11,6 +11,7 @@ from typing import Dict, List, Tuple, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -93,9 +94,19 @@ class FaceManipulationDetector:
     """Detect face swaps, reenactments, and expressions"""
     
     def __init__(self):
-        self.face_cascade = cv2.CascadeClassifier(
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-        )
+        # The analyzer singleton is shared by concurrent worker threads, and
+        # a CascadeClassifier is not safe to share between threads
+        self._cascades = threading.local()
+    
+    @property
+    def face_cascade(self) -> cv2.CascadeClassifier:
+        """This thread's Haar face cascade, loaded on first use"""
+        cascade = getattr(self._cascades, "cascade", None)
+        if cascade is None:
+            cascade = self._cascades.cascade = cv2.CascadeClassifier(
+                cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
+            )
+        return cascade
     
     def detect_face_swap(self, video_frames: List[np.ndarray]) -> Dict[str, Any]:
         """Detect face swap by analyzing face consistency"""
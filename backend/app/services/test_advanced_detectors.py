@@ -0,0 +1,143 @@
+"""Tests for CoalescingDetector's request coalescing and cancellation handling"""
+
+import asyncio
+import hashlib
+import os
+import threading
+
+import pytest
+
+from app.services import advanced_detectors
+from app.services.advanced_detectors import CoalescingDetector
+
+CONTENT = b"identical upload bytes"
+
+
+class _BlockingDetector:
+    """Image detector whose analysis waits until the test releases it"""
+
+    def __init__(self):
+        self.calls = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def analyze_image(self, path: str):
+        self.calls.append(path)
+        self.started.set()
+        assert self.release.wait(5)
+        with open(path, "rb") as f:
+            return {"analyzed": f.read()}
+
+
+@pytest.fixture
+def detector(monkeypatch):
+    fake = _BlockingDetector()
+    monkeypatch.setattr(advanced_detectors, "get_advanced_detector", lambda media_type: fake)
+    return fake
+
+
+@pytest.fixture
+def digests(monkeypatch):
+    """Count finished content digests, so a test can tell a request has hashed its upload"""
+    done = []
+    digest = advanced_detectors._file_digest
+
+    def counting_digest(path):
+        result = digest(path)
+        done.append(path)
+        return result
+
+    monkeypatch.setattr(advanced_detectors, "_file_digest", counting_digest)
+    return done
+
+
+def _upload(tmp_path, name: str, content: bytes = CONTENT) -> str:
+    path = tmp_path / name
+    path.write_bytes(content)
+    return str(path)
+
+
+def _run_inputs(tmp_path):
+    return [name for name in os.listdir(tmp_path) if ".run-" in name]
+
+
+async def _joined(digests, count: int):
+    """Wait until ``count`` requests have hashed their upload and looked up the in-flight run"""
+    while len(digests) < count:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+
+
+@pytest.mark.asyncio
+async def test_identical_content_shares_one_run(tmp_path, detector, digests):
+    coalescing = CoalescingDetector("image")
+    first_upload = _upload(tmp_path, "first.jpg")
+
+    first = asyncio.ensure_future(coalescing.analyze_with_digest(first_upload))
+    await asyncio.to_thread(detector.started.wait, 5)
+    # The request that staged the upload may delete it mid-run
+    os.remove(first_upload)
+    second = asyncio.ensure_future(coalescing.analyze_with_digest(_upload(tmp_path, "second.jpg")))
+    await _joined(digests, 2)
+    detector.release.set()
+
+    (first_result, first_key), (second_result, second_key) = await asyncio.gather(first, second)
+
+    assert len(detector.calls) == 1
+    assert first_result is second_result
+    assert first_result == {"analyzed": CONTENT}
+    assert first_key == second_key == hashlib.sha256(CONTENT).hexdigest()
+    assert _run_inputs(tmp_path) == []
+    assert coalescing._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_different_content_runs_separately(tmp_path, detector):
+    coalescing = CoalescingDetector("image")
+    detector.release.set()
+
+    results = await asyncio.gather(
+        coalescing.analyze(_upload(tmp_path, "a.jpg", b"a")),
+        coalescing.analyze(_upload(tmp_path, "b.jpg", b"b")),
+    )
+
+    assert results == [{"analyzed": b"a"}, {"analyzed": b"b"}]
+    assert len(detector.calls) == 2
+    assert _run_inputs(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_the_shared_run(tmp_path, detector, digests):
+    coalescing = CoalescingDetector("image")
+
+    cancelled = asyncio.ensure_future(coalescing.analyze(_upload(tmp_path, "first.jpg")))
+    await asyncio.to_thread(detector.started.wait, 5)
+    survivor = asyncio.ensure_future(coalescing.analyze(_upload(tmp_path, "second.jpg")))
+    await _joined(digests, 2)
+
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    detector.release.set()
+
+    assert await survivor == {"analyzed": CONTENT}
+    assert len(detector.calls) == 1
+    assert _run_inputs(tmp_path) == []
+
+
+@pytest.mark.asyncio
+async def test_run_finishes_and_cleans_up_when_its_only_waiter_is_cancelled(tmp_path, detector):
+    coalescing = CoalescingDetector("image")
+
+    request = asyncio.ensure_future(coalescing.analyze(_upload(tmp_path, "upload.jpg")))
+    await asyncio.to_thread(detector.started.wait, 5)
+    request.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await request
+    (run,) = coalescing._inflight.values()
+    detector.release.set()
+
+    assert await run == {"analyzed": CONTENT}
+    await asyncio.sleep(0)
+    assert coalescing._inflight == {}
+    assert _run_inputs(tmp_path) == []
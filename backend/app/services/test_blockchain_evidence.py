@@ -0,0 +1,95 @@
+"""Tests for incremental evidence-chain verification"""
+
+import hashlib
+
+import pytest
+
+from app.services import blockchain_evidence
+from app.services.blockchain_evidence import (
+    EvidenceManager,
+    add_evidence,
+    create_evidence_chain,
+    verify_evidence_chain,
+)
+
+CASE_ID = "case-incremental"
+
+
+@pytest.fixture(autouse=True)
+def evidence_dir(tmp_path, monkeypatch):
+    """Keep chain files in a scratch directory and start with no cases"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(blockchain_evidence, "evidence_manager", EvidenceManager())
+
+
+def _add(count: int):
+    for i in range(count):
+        add_evidence(
+            CASE_ID,
+            evidence_path=f"evidence-{i}.jpg",
+            evidence_type="IMAGE",
+            detection_result={"is_fake": False},
+            file_metadata={"name": f"evidence-{i}.jpg"},
+            evidence_hash=hashlib.sha256(f"evidence-{i}".encode()).hexdigest(),
+        )
+
+
+def _chain():
+    return blockchain_evidence.evidence_manager.get_chain(CASE_ID)
+
+
+def test_incremental_verify_only_rechecks_new_blocks():
+    create_evidence_chain(CASE_ID, "investigator")
+    _add(3)
+
+    first = verify_evidence_chain(CASE_ID, incremental=True)
+    again = verify_evidence_chain(CASE_ID, incremental=True)
+    _add(2)
+    after_append = verify_evidence_chain(CASE_ID, incremental=True)
+
+    assert first["valid"] and first["blocks_verified"] == 3
+    assert again["valid"] and again["blocks_verified"] == 0
+    assert after_append["valid"] and after_append["blocks_verified"] == 2
+    assert after_append["chain_length"] == 6
+
+
+def test_full_verify_still_rechecks_every_block():
+    create_evidence_chain(CASE_ID, "investigator")
+    _add(3)
+    verify_evidence_chain(CASE_ID, incremental=True)
+
+    report = verify_evidence_chain(CASE_ID)
+
+    assert report["valid"] and report["blocks_verified"] == 3
+
+
+def test_tampered_new_block_fails_and_is_not_marked_verified():
+    create_evidence_chain(CASE_ID, "investigator")
+    _add(2)
+    verify_evidence_chain(CASE_ID, incremental=True)
+    _add(1)
+    _chain().chain[-1].evidence_hash = "0" * 64
+
+    report = verify_evidence_chain(CASE_ID, incremental=True)
+    retry = verify_evidence_chain(CASE_ID, incremental=True)
+
+    assert not report["valid"]
+    assert [issue["block_index"] for issue in report["issues"]] == [3]
+    assert report["issues"][0]["issue"] == "Block hash mismatch"
+    assert not retry["valid"] and retry["blocks_verified"] == 1
+
+
+def test_tampering_with_verified_blocks_needs_a_full_verify():
+    create_evidence_chain(CASE_ID, "investigator")
+    _add(2)
+    verify_evidence_chain(CASE_ID, incremental=True)
+    _chain().chain[1].evidence_hash = "0" * 64
+
+    assert verify_evidence_chain(CASE_ID, incremental=True)["valid"]
+    assert not verify_evidence_chain(CASE_ID)["valid"]
+
+
+def test_unknown_case_is_invalid():
+    report = verify_evidence_chain("no-such-case", incremental=True)
+
+    assert report == {"valid": False, "error": "Case no-such-case not found"}
@@ -4,7 +4,7 @@
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel, EmailStr
 from typing import Optional, Dict, List
 from datetime import datetime, timedelta
@@ -35,7 +35,8 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 app = FastAPI(
     title="DeepClean.AI - National Deepfake Detection Platform",
     version="2.0.0",
-    description="Government-Grade Forensic Analysis • Real ML Detection • Blockchain Evidence • Court-Admissible Reports"
+    description="Government-Grade Forensic Analysis • Real ML Detection • Blockchain Evidence • Court-Admissible Reports",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(